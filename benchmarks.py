@@ -0,0 +1,291 @@
+import argparse
+import io
+import json
+import os
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import boardarray
+import gameboard
+import render
+import solver
+
+# Regressions smaller than this many seconds are put down to noise, however large they are relative to the baseline.
+MIN_TIME_DELTA = 0.005
+
+# The code whose cold start check_imports measures: looking up a tour that is already in the cache, as solving a board
+# that has been solved before does.
+COLD_LOOKUP = 'import tours; tours.winning_path(8, 8, [1, 1])'
+
+# The most milliseconds that the imports of COLD_LOOKUP may take in a fresh interpreter, on top of Python's own.
+IMPORT_BUDGET_MS = 25
+
+# Modules that COLD_LOOKUP mustn't import, since they are only needed to search for tours, or are optional backends.
+LAZY_MODULES = ['solver', 'stitched', 'numpy', 'multiprocessing', 'concurrent.futures', 'asyncio']
+
+
+def solver_case(width, height, start):
+    """Returns a case that runs the search from <start> on a <width> by <height> board, without the cache."""
+    def run():
+        state = solver.TourState(width, height)
+        state.visit(state.square(start))
+        search = solver.TourSearch(state)
+        solved = search.run()
+        return {'solved': solved, 'nodes': search.nodes, 'backtracks': search.backtracks}
+    return run
+
+
+def stitched_case(width, height, start):
+    """Returns a case that stitches together a tour of a <width> by <height> board from <start>."""
+    def run():
+        state = solver.solve(width, height, start)
+        return {'solved': state is not None and state.is_complete()}
+    return run
+
+
+def replay(width, height, turns):
+    """Returns the first <turns> squares of a tour of a <width> by <height> board from its corner, to replay as a
+    game."""
+    state = solver.solve(width, height, [1, 1], stitch=False)
+    return [state.position(square) for square in state.path[:turns]]
+
+
+def overlay_case(width, height, turns, incremental):
+    """Returns a case that plays <turns> turns of the game, updating the Warnsdorff counts as KnightsTour does.
+
+    With <incremental> set, the counts are updated with update_warnsdorff_counts; otherwise the whole count board is
+    rebuilt every turn with board_with_warnsdorff_counts.
+    """
+    positions = replay(width, height, turns)
+
+    def run():
+        board = gameboard.game_board([width, height])
+        board_with_counts = gameboard.game_board([width, height])
+        state = solver.TourState(width, height)
+        previous = [None, None]
+        for position in positions:
+            if None not in previous:
+                gameboard.make_move(board, previous, '*')
+            gameboard.make_move(board, position, 'X')
+            state.visit(state.square(position))
+            if incremental:
+                board_with_counts = gameboard.update_warnsdorff_counts(board_with_counts, board, state, previous,
+                                                                     position)
+            else:
+                board_with_counts = gameboard.board_with_warnsdorff_counts(board, position)
+            previous = position
+        return {}
+    return run
+
+
+def render_case(width, height, format='text'):
+    """Returns a case that writes a tour of a <width> by <height> board in <format>, into memory rather than a file.
+
+    The text format prints the numbered board, as print_board does, and the others are the compact formats of render.
+    """
+    path = solver.solve(width, height, [1, 1]).path
+    board = gameboard.board_from_path(width, height, path)
+
+    def run():
+        if format == 'text':
+            render.print_board(board, stream=io.StringIO())
+        elif format == 'csv':
+            render.write_csv(width, height, path, io.StringIO())
+        elif format == 'moves':
+            render.write_moves(width, path, io.StringIO())
+        else:
+            render.write_pgm(width, height, path, io.BytesIO())
+        return {}
+    return run
+
+
+def degrees_case(width, height):
+    """Returns a case that counts the Warnsdorff counts of every square of a half-toured <width> by <height> board.
+
+    The counts are worked out by boardarray.degree_array, with NumPy if it is installed.
+    """
+    path = solver.solve(width, height, [1, 1]).path
+
+    def run():
+        state = solver.TourState(width, height)
+        state.follow(path[:len(path) // 2])
+        return {'numpy': boardarray.numpy_module() is not None, 'degree_sum': sum(state.degrees)}
+    return run
+
+
+def workloads() -> dict:
+    """Returns the fixed benchmark cases, keyed by name. The cases are only set up when they are run."""
+    return {
+        'solve-3x3-unsolvable': lambda: solver_case(3, 3, [1, 1]),
+        'solve-4x4-unsolvable': lambda: solver_case(4, 4, [1, 1]),
+        'solve-5x5-corner': lambda: solver_case(5, 5, [1, 1]),
+        'solve-5x5-unsolvable': lambda: solver_case(5, 5, [2, 1]),
+        'solve-4x8-unsolvable': lambda: solver_case(4, 8, [2, 1]),
+        'solve-8x8-corner': lambda: solver_case(8, 8, [1, 1]),
+        'solve-8x8-center': lambda: solver_case(8, 8, [4, 5]),
+        'solve-50x50': lambda: solver_case(50, 50, [1, 1]),
+        'solve-100x100': lambda: solver_case(100, 100, [17, 42]),
+        'solve-stitched-400x400': lambda: stitched_case(400, 400, [200, 1]),
+        'overlay-full-30x30': lambda: overlay_case(30, 30, 200, incremental=False),
+        'overlay-incremental-30x30': lambda: overlay_case(30, 30, 200, incremental=True),
+        'overlay-incremental-300x300': lambda: overlay_case(300, 300, 2000, incremental=True),
+        'degrees-1000x1000': lambda: degrees_case(1000, 1000),
+        'render-100x100': lambda: render_case(100, 100),
+        'render-300x300': lambda: render_case(300, 300),
+        'render-csv-1000x1000': lambda: render_case(1000, 1000, 'csv'),
+        'render-moves-1000x1000': lambda: render_case(1000, 1000, 'moves'),
+        'render-pgm-1000x1000': lambda: render_case(1000, 1000, 'pgm'),
+    }
+
+
+def measure(run, repeat) -> dict:
+    """Times <run>, keeping the best of <repeat> runs, and then runs it once more to find its peak memory use.
+
+    Memory is traced in a separate run, since tracing slows everything down and would distort the timings.
+    """
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        metrics = run()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+
+    tracemalloc.start()
+    try:
+        run()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return {'seconds': best, 'peak_bytes': peak, **metrics}
+
+
+def run_benchmarks(names=None, repeat=3) -> dict:
+    """Runs the named benchmark cases, or all of them, and returns their results keyed by name."""
+    cases = workloads()
+    results = {}
+    for name in names or cases:
+        results[name] = measure(cases[name](), repeat)
+        print(f"{name:32} {results[name]['seconds']:9.4f}s  {results[name]['peak_bytes'] / 1024:10.1f} KiB"
+              f"  nodes={results[name].get('nodes', '-')}  backtracks={results[name].get('backtracks', '-')}",
+              file=sys.stderr)
+    return results
+
+
+def regressions(results, baseline, tolerance) -> list:
+    """Compares <results> with <baseline> and describes every case that got worse.
+
+    A case regresses if it is more than <tolerance> (a fraction) and MIN_TIME_DELTA seconds slower than the baseline,
+    uses more than <tolerance> more peak memory, or expands more nodes. Cases missing from either side are skipped.
+    """
+    found = []
+    for name, result in results.items():
+        before = baseline.get(name)
+        if before is None:
+            continue
+        slower = result['seconds'] - before['seconds']
+        if slower > MIN_TIME_DELTA and result['seconds'] > before['seconds'] * (1 + tolerance):
+            found.append(f"{name}: {before['seconds']:.4f}s -> {result['seconds']:.4f}s")
+        if result['peak_bytes'] > before['peak_bytes'] * (1 + tolerance):
+            found.append(f"{name}: peak memory {before['peak_bytes']} -> {result['peak_bytes']} bytes")
+        if 'nodes' in before and result.get('nodes', 0) > before['nodes']:
+            found.append(f"{name}: nodes {before['nodes']} -> {result['nodes']}")
+    return found
+
+
+def import_times(code) -> dict:
+    """Runs <code> in a fresh interpreter with python -X importtime, and returns how long its imports took.
+
+    Return:
+        times (dict): (depth, microseconds) for every module imported, keyed by name, where depth is 0 for the modules
+        imported by <code> or by Python itself on start up, 1 for those they import, and so on, and microseconds is
+        how long the module took to import, including the modules it imported.
+    """
+    completed = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], capture_output=True, text=True,
+                               cwd=os.path.dirname(os.path.abspath(__file__)))
+    if completed.returncode:
+        raise RuntimeError(f'{code!r} failed:\n{completed.stderr}')
+
+    times = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line.split('|')
+        times[name.strip()] = ((len(name) - len(name.lstrip()) - 1) // 2, int(cumulative))
+    return times
+
+
+def check_imports(repeat=3) -> list:
+    """Checks that a cold start of COLD_LOOKUP imports no LAZY_MODULES, and that its imports fit IMPORT_BUDGET_MS.
+
+    The lookup is run once first, in this process, so that the tour is in the cache. The time of its imports is the
+    best of <repeat> fresh interpreters, leaving out the modules that Python imports on start up anyway.
+
+    Return:
+        problems (list): A description of every module imported that shouldn't have been, and of the budget if it
+        was exceeded.
+    """
+    exec(COLD_LOOKUP, {})
+    startup = set(import_times('pass'))
+
+    best = None
+    for _ in range(repeat):
+        times = import_times(COLD_LOOKUP)
+        total = sum(microseconds for name, (depth, microseconds) in times.items()
+                    if depth == 0 and name not in startup) / 1000
+        best = total if best is None else min(best, total)
+    print(f'{"cold lookup imports":32} {best:9.1f}ms  (budget {IMPORT_BUDGET_MS}ms)', file=sys.stderr)
+
+    problems = [f'{COLD_LOOKUP!r} imports {name}' for name in LAZY_MODULES if name in times]
+    if best > IMPORT_BUDGET_MS:
+        problems.append(f'{COLD_LOOKUP!r} imports took {best:.1f}ms, over the budget of {IMPORT_BUDGET_MS}ms')
+    return problems
+
+
+def main(argv=None) -> int:
+    """Runs the benchmarks from the command line, and returns 1 if any regressed against the baseline."""
+    parser = argparse.ArgumentParser(description='Benchmark the solver, the Warnsdorff overlay and rendering.')
+    parser.add_argument('cases', nargs='*', help='names of the cases to run (default: all)')
+    parser.add_argument('--output', help='file to write the results to, as JSON')
+    parser.add_argument('--baseline', help='results of an earlier run to compare with')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='fraction by which a case may be slower or use more memory than the baseline '
+                             '(default: 0.25)')
+    parser.add_argument('--repeat', type=int, default=3, help='runs per case; the fastest is kept (default: 3)')
+    parser.add_argument('--list', action='store_true', help='list the cases and exit')
+    parser.add_argument('--imports', action='store_true',
+                        help='only check that a cached lookup starts up within the import budget, and exit')
+    arguments = parser.parse_args(argv)
+
+    if arguments.list:
+        print('\n'.join(workloads()))
+        return 0
+    if arguments.imports:
+        found = check_imports(arguments.repeat)
+        for problem in found:
+            print(f'REGRESSION {problem}', file=sys.stderr)
+        return 1 if found else 0
+
+    unknown = set(arguments.cases) - set(workloads())
+    if unknown:
+        parser.error(f"unknown cases: {', '.join(sorted(unknown))}")
+
+    results = run_benchmarks(arguments.cases, arguments.repeat)
+    if arguments.output:
+        with open(arguments.output, 'w') as output:
+            json.dump(results, output, indent=2)
+
+    if arguments.baseline:
+        with open(arguments.baseline) as baseline:
+            found = regressions(results, json.load(baseline), arguments.tolerance)
+        for regression in found:
+            print(f'REGRESSION {regression}', file=sys.stderr)
+        return 1 if found else 0
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
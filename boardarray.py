@@ -0,0 +1,197 @@
+from array import array
+from functools import lru_cache
+
+import moves
+
+# Boards with fewer squares than this are counted in pure Python even when NumPy is installed, since for them the
+# cost of importing NumPy and converting the arrays outweighs what the vectorized counting saves.
+NUMPY_MIN_SQUARES = 4096
+
+# Maps the byte of the last character of a spot to 1 if the spot has been visited ('X' or '*'), and to 0 otherwise.
+VISITED_MARKS = bytes(1 if chr(byte) in 'X*' else 0 for byte in range(256))
+
+
+@lru_cache(maxsize=None)
+def numpy_module():
+    """Returns the numpy module, or None if it isn't installed. It is only imported the first time it is asked for.
+
+    NumPy is an optional dependency: everything in this module works without it, only more slowly on large boards.
+    Install it with `pip install numpy` to use the vectorized backend.
+    """
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def numpy_degree_map(unvisited):
+    """Returns the Warnsdorff count of every square of a board, worked out by NumPy.
+
+    Each of the eight knight moves is one slice of a copy of the board padded by two squares on every side, shifted by
+    that move, so the counts of the whole board take eight vectorized additions.
+
+    Args:
+        unvisited (numpy.ndarray): A (height, width) array of uint8, 1 for every square that hasn't been visited and 0
+                for the rest. Row y - 1 is row y of the board.
+
+    Return:
+        degrees (numpy.ndarray): A (height, width) array of uint8 holding the number of unvisited squares a knight move
+        away from each square.
+    """
+    numpy = numpy_module()
+    height, width = unvisited.shape
+    padded = numpy.zeros((height + 4, width + 4), dtype=numpy.uint8)
+    padded[2:height + 2, 2:width + 2] = unvisited
+
+    degrees = numpy.zeros((height, width), dtype=numpy.uint8)
+    for dx, dy in moves.KNIGHT_MOVES:
+        degrees += padded[2 + dy:2 + dy + height, 2 + dx:2 + dx + width]
+    return degrees
+
+
+def degree_array(width, height, order) -> array:
+    """Returns the Warnsdorff count of every square of a <width> by <height> board, as solver.TourState keeps them.
+
+    Large boards are counted by numpy_degree_map when NumPy is installed, and the rest square by square.
+
+    Args:
+        width (int): The width of the board.
+        height (int): The height of the board.
+        order (array): The step at which each square was visited, 0 for unvisited squares, as in solver.TourState.
+
+    Return:
+        degrees (array): An array of unsigned bytes with the number of unvisited squares a knight move away from each
+        square, by square index (see moves.square_index).
+    """
+    numpy = numpy_module() if width * height >= NUMPY_MIN_SQUARES else None
+    if numpy is None:
+        table = moves.neighbor_table(width, height)
+        return array('B', [sum(1 for neighbor in neighbors if not order[neighbor]) for neighbors in table])
+
+    unvisited = (numpy.frombuffer(order, dtype=numpy.uint32) == 0).astype(numpy.uint8).reshape(height, width)
+    return array('B', numpy_degree_map(unvisited).tobytes())
+
+
+class ArrayBoard:
+    """The squares of a game board that have been visited, kept as one byte per square rather than as strings.
+
+    With NumPy, the bytes are a (height, width) uint8 array, and the Warnsdorff counts of the whole board, whether the
+    game is won and how many squares have been visited are each worked out in one vectorized operation. Without it, a
+    bytearray is used, and the same questions are answered in pure Python, so the board works the same either way. By
+    default NumPy is only used for boards of at least NUMPY_MIN_SQUARES squares, as in degree_array.
+
+    This is how gameboard answers these questions about the string boards of the game: from_board reads such a board
+    in a few passes over its characters in C, rather than by stripping every spot in Python.
+
+    Attributes:
+        width (int): The width of the board.
+        height (int): The height of the board.
+        visited: 1 for every visited square and 0 for the rest, by square index (see moves.square_index). This is a
+                numpy.ndarray of shape (height, width) with NumPy, and a bytearray without it.
+        knight (list or None): The Cartesian position [x, y] of the 'X' of the board read by from_board, if it has one.
+    """
+
+    def __init__(self, width, height, use_numpy=None):
+        self.width = width
+        self.height = height
+        self.knight = None
+        if use_numpy is None:
+            use_numpy = width * height >= NUMPY_MIN_SQUARES and numpy_module() is not None
+        self.numpy = numpy_module() if use_numpy else None
+        if use_numpy and self.numpy is None:
+            raise ImportError('NumPy is not installed')
+
+        if self.numpy is not None:
+            self.visited = self.numpy.zeros((height, width), dtype=self.numpy.uint8)
+        else:
+            self.visited = bytearray(width * height)
+
+    @classmethod
+    def from_board(cls, board, use_numpy=None):
+        """Returns an ArrayBoard with the spots of <board> that hold an 'X' or a '*' marked as visited.
+
+        A spot has been visited if its last character is an 'X' or a '*'. When every row joins into a string of the
+        same length, a whole number of spots long, its spots are taken to be as long as each other, as on the boards
+        made by gameboard.game_board and gameboard.make_move, and these characters are picked out of the whole board at
+        once, by joining it into one string and slicing every spot's last character from it.
+
+        Args:
+            board (list): A list of lists, whose internal elements are either underscores, 'X', or '*'.
+                    An * or X may be preceded by one or more spaces.
+            use_numpy (bool): Whether to use NumPy, or None to decide by the size of the board.
+        """
+        width = len(board[0])
+        height = len(board)
+        array_board = cls(width, height, use_numpy)
+
+        rows = list(map(''.join, board))
+        spot_length = len(board[0][0])
+        if spot_length and set(map(len, rows)) == {spot_length * width} and set(map(len, board)) == {width}:
+            marks = ''.join(rows)[spot_length - 1::spot_length]
+        else:
+            marks = ''.join([spot.rstrip()[-1:] or '_' for row in board for spot in row])
+        visited = marks.encode('latin-1', 'replace').translate(VISITED_MARKS)
+
+        if array_board.numpy is not None:
+            numpy = array_board.numpy
+            array_board.visited = numpy.frombuffer(visited, dtype=numpy.uint8).reshape(height, width).copy()
+        else:
+            array_board.visited = bytearray(visited)
+        knight = marks.find('X')
+        if knight != -1:
+            array_board.knight = moves.square_position(knight, width)
+        return array_board
+
+    def _flat(self):
+        """Returns the visited bytes as a flat sequence, indexed by square."""
+        return self.visited.reshape(-1) if self.numpy is not None else self.visited
+
+    def visit(self, position) -> None:
+        """Marks the Cartesian <position> [x, y] as visited."""
+        self._flat()[moves.square_index(position, self.width)] = 1
+
+    def is_visited(self, position) -> bool:
+        """Checks whether the Cartesian <position> [x, y] has been visited."""
+        return bool(self._flat()[moves.square_index(position, self.width)])
+
+    def degree(self, position) -> int:
+        """Returns the Warnsdorff count of the Cartesian <position> [x, y], without working out those of the rest."""
+        visited = self._flat()
+        neighbors = moves.neighbor_table(self.width, self.height)[moves.square_index(position, self.width)]
+        return sum(1 for neighbor in neighbors if not visited[neighbor])
+
+    def degree_map(self) -> list:
+        """Returns the Warnsdorff counts of every square: the number of unvisited squares a knight move away from it.
+
+        Return:
+            degrees (list): A list of rows, one per y, each with the count of every square of that row. With NumPy,
+            this is a (height, width) numpy.ndarray instead.
+        """
+        if self.numpy is not None:
+            return numpy_degree_map(1 - self.visited)
+
+        visited = self.visited
+        table = moves.neighbor_table(self.width, self.height)
+        degrees = [sum(1 for neighbor in neighbors if not visited[neighbor]) for neighbors in table]
+        return [degrees[row_start:row_start + self.width] for row_start in range(0, len(degrees), self.width)]
+
+    def spots_visited(self) -> int:
+        """Returns the number of squares that have been visited, like gameboard.spots_visited."""
+        if self.numpy is not None:
+            return int(self.visited.sum(dtype=self.numpy.int64))
+        return self.visited.count(1)
+
+    def is_won(self) -> bool:
+        """Checks whether every square has been visited, like gameboard.game_is_won."""
+        if self.numpy is not None:
+            return bool(self.visited.all())
+        return 0 not in self.visited
+
+    def is_dead_end(self, position) -> bool:
+        """Checks whether the knight at the Cartesian <position> [x, y] has no unvisited square left to move to, like
+        gameboard.board_is_dead_end."""
+        neighbors = moves.neighbor_table(self.width, self.height)[moves.square_index(position, self.width)]
+        if self.numpy is not None:
+            return bool(self.visited.reshape(-1)[list(neighbors)].all())
+        return all(self.visited[neighbor] for neighbor in neighbors)
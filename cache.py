@@ -0,0 +1,248 @@
+import os
+import sqlite3
+import threading
+import time
+
+import moves
+
+# Where the cache is kept, unless KNIGHTS_TOUR_CACHE names another file.
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser('~'), '.cache', 'knights_tour', 'tours.sqlite3')
+
+# The most bytes of packed tours the cache keeps before it evicts the least recently used ones.
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# The most entries the cache keeps, whatever their size, so that starts proven to have no tour, which store no moves,
+# are evicted too.
+DEFAULT_MAX_ROWS = 250_000
+
+# How many lookups are marked as recently used in memory before they are written to the file together.
+TOUCH_BATCH = 64
+
+# The caches opened by default_cache, one per thread, since a SQLite connection can only be used by the thread that
+# opened it.
+_default_caches = threading.local()
+
+
+def symmetries(width, height) -> list:
+    """Returns the symmetries of the board that map it onto a board at most as wide as it is high.
+
+    A symmetry is a tuple (transpose, flip_x, flip_y): the board is first transposed (x and y swapped) if <transpose>
+    is True, and then mirrored left to right and top to bottom if <flip_x> and <flip_y> are. A square board has all 8
+    of these symmetries, and any other board has the 4 that leave its shorter side as the width.
+    """
+    transposes = [width > height] if width != height else [False, True]
+    return [(transpose, flip_x, flip_y) for transpose in transposes for flip_x in [False, True]
+            for flip_y in [False, True]]
+
+
+def transform_square(square, width, height, symmetry) -> int:
+    """Returns the index of <square> of a <width> by <height> board after the board is transformed by <symmetry>."""
+    transpose, flip_x, flip_y = symmetry
+    y, x = divmod(square, width)
+    if transpose:
+        x, y = y, x
+        width, height = height, width
+    if flip_x:
+        x = width - 1 - x
+    if flip_y:
+        y = height - 1 - y
+    return y * width + x
+
+
+def inverse_transform_square(square, width, height, symmetry) -> int:
+    """Undoes transform_square: returns the index on a <width> by <height> board of <square> of the transformed one."""
+    transpose, flip_x, flip_y = symmetry
+    canonical_width, canonical_height = (height, width) if transpose else (width, height)
+    y, x = divmod(square, canonical_width)
+    if flip_x:
+        x = canonical_width - 1 - x
+    if flip_y:
+        y = canonical_height - 1 - y
+    if transpose:
+        x, y = y, x
+    return y * width + x
+
+
+def canonical_key(width, height, start) -> tuple:
+    """Returns the key that a <width> by <height> board and Cartesian <start> share with all of their symmetries.
+
+    Of the boards given by symmetries, the one whose transformed start square has the lowest index is chosen.
+
+    Return:
+        key (tuple): (canonical width, canonical height, index of the canonical start square, symmetry), where the
+        symmetry maps the given board onto the canonical one.
+    """
+    start_square = moves.square_index(start, width)
+    best = None
+    for symmetry in symmetries(width, height):
+        square = transform_square(start_square, width, height, symmetry)
+        if best is None or square < best[0]:
+            best = (square, symmetry)
+
+    canonical_width, canonical_height = (height, width) if best[1][0] else (width, height)
+    return canonical_width, canonical_height, best[0], best[1]
+
+
+class TourCache:
+    """An on-disk cache of the tours found for each board size and starting square, and of the starts proven to have
+    no tour.
+
+    Tours are stored once for each set of symmetric boards and starts (see canonical_key), with their moves packed by
+    moves.pack_directions. Every lookup marks the entry as recently used, and once the packed tours take up more than
+    <max_bytes>, or there are more than <max_rows> entries, the least recently used entries are evicted. Lookups are
+    marked in memory and written out TOUCH_BATCH at a time, or with the next entry stored, so a hit doesn't have to
+    write to the file; the few that haven't been written when the process ends only make the eviction order a little
+    less exact. The cache only needs sqlite3 and moves, so a hit never has to import the solver.
+    """
+
+    def __init__(self, path=None, max_bytes=DEFAULT_MAX_BYTES, max_rows=DEFAULT_MAX_ROWS):
+        self.path = path or os.environ.get('KNIGHTS_TOUR_CACHE') or DEFAULT_CACHE_PATH
+        self.max_bytes = max_bytes
+        self.max_rows = max_rows
+        self._last_used = 0
+        self._touched = {}
+
+        if self.path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self.connection = sqlite3.connect(self.path)
+        self.connection.execute(
+            'CREATE TABLE IF NOT EXISTS tours ('
+            'width INTEGER, height INTEGER, start INTEGER, solvable INTEGER, moves BLOB, last_used INTEGER, '
+            'PRIMARY KEY (width, height, start))'
+        )
+        self.connection.execute('CREATE INDEX IF NOT EXISTS tours_last_used ON tours (last_used)')
+        self.connection.execute(
+            'CREATE TABLE IF NOT EXISTS maps (width INTEGER, height INTEGER, answers BLOB, PRIMARY KEY (width, height))'
+        )
+        self.connection.commit()
+
+    def _touch(self) -> int:
+        """Returns the time in nanoseconds, to mark an entry as the most recently used, and never the same time twice.
+
+        Every process sharing the file marks its entries with the same clock, so no lookup of the other entries is
+        needed to find a later mark.
+        """
+        self._last_used = max(time.time_ns(), self._last_used + 1)
+        return self._last_used
+
+    def _write_touches(self) -> None:
+        """Writes the marks of the lookups made since they were last written, without committing them."""
+        self.connection.executemany('UPDATE tours SET last_used = ? WHERE width = ? AND height = ? AND start = ?',
+                                    [(last_used, *key) for key, last_used in self._touched.items()])
+        self._touched.clear()
+
+    def get(self, width, height, start):
+        """Looks up the tour of a <width> by <height> board starting from the Cartesian position <start>.
+
+        Return:
+            path (list or None): None if nothing is cached for the board and start, an empty list if there is no tour
+            from <start>, and otherwise the indices (see moves.square_index) of the squares of the tour, in order.
+        """
+        canonical_width, canonical_height, canonical_start, symmetry = canonical_key(width, height, start)
+        key = (canonical_width, canonical_height, canonical_start)
+        row = self.connection.execute('SELECT solvable, moves FROM tours WHERE width = ? AND height = ? AND start = ?',
+                                      key).fetchone()
+        if row is None:
+            return None
+
+        self._touched[key] = self._touch()
+        if len(self._touched) >= TOUCH_BATCH:
+            self._write_touches()
+            self.connection.commit()
+        if not row[0]:
+            return []
+
+        canonical_path = moves.unpack_directions(row[1], canonical_start, width * height, canonical_width)
+        return [inverse_transform_square(square, width, height, symmetry) for square in canonical_path]
+
+    def put(self, width, height, start, path) -> None:
+        """Stores the tour <path> of a <width> by <height> board starting from the Cartesian position <start>.
+
+        Args:
+            width (int): The width of the board.
+            height (int): The height of the board.
+            start (list): The Cartesian position [x, y] the tour starts from.
+            path (list): The indices of the squares of the tour, in order, or an empty list if there is no tour.
+        """
+        canonical_width, canonical_height, canonical_start, symmetry = canonical_key(width, height, start)
+        packed = None
+        if path:
+            canonical_path = [transform_square(square, width, height, symmetry) for square in path]
+            packed = moves.pack_directions(canonical_path, canonical_width)
+
+        self.connection.execute('INSERT OR REPLACE INTO tours VALUES (?, ?, ?, ?, ?, ?)',
+                                (canonical_width, canonical_height, canonical_start, int(bool(path)), packed,
+                                 self._touch()))
+        self._write_touches()
+        self._evict()
+        self.connection.commit()
+
+    def get_map(self, width, height):
+        """Looks up the solvability map (see solvability.solvability_map) of a <width> by <height> board.
+
+        Maps are stored once for a board and its transpose, as the map of the one that is at most as wide as it is
+        high.
+
+        Return:
+            answers (bytes or None): The answer for every square, by square index, or None if the map isn't cached.
+        """
+        transpose = width > height
+        key = (height, width) if transpose else (width, height)
+        row = self.connection.execute('SELECT answers FROM maps WHERE width = ? AND height = ?', key).fetchone()
+        if row is None:
+            return None
+        if not transpose:
+            return bytes(row[0])
+        return bytes(row[0][x * height + y] for y in range(height) for x in range(width))
+
+    def put_map(self, width, height, answers) -> None:
+        """Stores the solvability map <answers>, one per square index, of a <width> by <height> board."""
+        if width > height:
+            answers = bytes(answers[x * width + y] for y in range(width) for x in range(height))
+            width, height = height, width
+        self.connection.execute('INSERT OR REPLACE INTO maps VALUES (?, ?, ?)', (width, height, bytes(answers)))
+        self.connection.commit()
+
+    def _evict(self) -> None:
+        """Deletes the least recently used entries until the packed tours fit in max_bytes and there are no more than
+        max_rows entries."""
+        count, total = self.connection.execute('SELECT COUNT(*), COALESCE(SUM(LENGTH(moves)), 0) FROM tours').fetchone()
+        if count <= self.max_rows and total <= self.max_bytes:
+            return
+        rows = self.connection.execute('SELECT width, height, start, COALESCE(LENGTH(moves), 0) FROM tours '
+                                       'ORDER BY last_used')
+        evicted = []
+        for width, height, start, size in rows:
+            if count <= self.max_rows and total <= self.max_bytes:
+                break
+            evicted.append((width, height, start))
+            total -= size
+            count -= 1
+        self.connection.executemany('DELETE FROM tours WHERE width = ? AND height = ? AND start = ?', evicted)
+
+    def clear(self) -> None:
+        """Deletes every entry in the cache."""
+        self._touched.clear()
+        self.connection.execute('DELETE FROM tours')
+        self.connection.execute('DELETE FROM maps')
+        self.connection.commit()
+
+
+def default_cache():
+    """Returns the TourCache shared by the rest of the project, opening it the first time it is needed.
+
+    Each thread, and each process forked from this one, opens a connection of its own to the same file, so the cache
+    can be used from the workers of an executor.
+
+    Return:
+        cache (TourCache or None): The shared cache, or None if it couldn't be opened, in which case tours simply
+        aren't cached.
+    """
+    if getattr(_default_caches, 'pid', None) != os.getpid():
+        try:
+            _default_caches.cache = TourCache()
+        except (OSError, sqlite3.Error):
+            return None
+        _default_caches.pid = os.getpid()
+
+    return _default_caches.cache
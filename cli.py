@@ -0,0 +1,302 @@
+import argparse
+import json
+import sys
+
+import gameboard
+import moves
+import render
+import tours
+
+# The exit status of the solve command for each status of solve_job.
+EXIT_STATUS = {'solved': 0, 'unsolvable': 1, 'exhausted': 3}
+
+
+def parse_dimensions(text) -> list:
+    """Parses board dimensions written as '<width>x<height>', such as '8x8', into [width, height]."""
+    try:
+        width, height = map(int, text.lower().split('x'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid dimensions '{text}', expected <width>x<height>")
+    if width < 1 or height < 1:
+        raise argparse.ArgumentTypeError(f"invalid dimensions '{text}', both must be positive")
+    return [width, height]
+
+
+def solve_job(width, height, start, closed=False, use_cache=True, observer=None, timeout=None, max_nodes=None) -> dict:
+    """Solves one board and returns the result in the form it is written out as JSON.
+
+    Args:
+        width (int): The width of the board.
+        height (int): The height of the board.
+        start (list): The Cartesian position [x, y] of the first square of the tour.
+        closed (bool): Whether the tour has to be closed.
+        use_cache (bool): Whether to look up and store open tours in the on-disk cache.
+        observer (progress.SearchObserver): Watches the progress of the search, if one is needed.
+        timeout (float): The most seconds to search for, or None for no limit, unless <max_nodes> is None as well, in
+                which case the board gets tours.default_timeout.
+        max_nodes (int): The most moves to try, or None for no limit.
+
+    Return:
+        result (dict): The board size and start; the status, one of 'solved', 'unsolvable' or 'exhausted' (see
+        solver.solve_within); whether a tour exists, or None if the budget ran out before that was known; the tour as
+        a list of [x, y] positions, or None if there is no tour; and, if the budget ran out, the longest partial tour
+        found as 'partial'.
+    """
+    if not (0 < start[0] <= width and 0 < start[1] <= height):
+        raise ValueError(f'start {start} is not on a {width}x{height} board')
+
+    if timeout is None and max_nodes is None:
+        timeout = tours.default_timeout(width, height)
+    if closed or timeout is not None or max_nodes is not None:
+        import solver
+        if closed:
+            outcome = solver.solve_within(width, height, start, timeout, max_nodes, closed=True, observer=observer)
+        else:
+            outcome = tours.winning_result(width, height, start, timeout, max_nodes, use_cache=use_cache,
+                                             observer=observer)
+        status, path = outcome.status, outcome.path
+    else:
+        path = tours.winning_path(width, height, start, use_cache=use_cache, observer=observer)
+        status = 'solved' if path else 'unsolvable'
+
+    positions = [moves.square_position(square, width) for square in path]
+    result = {
+        'width': width,
+        'height': height,
+        'start': list(start),
+        'status': status,
+        'solvable': None if status == 'exhausted' else bool(path),
+        'tour': positions if status == 'solved' else None,
+    }
+    if status == 'exhausted':
+        result['partial'] = positions
+    return result
+
+
+def parse_job(line) -> dict:
+    """Parses one line of a batch file into the arguments of solve_job.
+
+    A line is either a JSON object, such as {"dims": "8x8", "start": [1, 1], "closed": false}, where "dims" may also
+    be [width, height] as the server takes it, or four space-separated integers, '<width> <height> <x> <y>'. A line
+    that isn't one of these raises ValueError.
+    """
+    line = line.strip()
+    if line.startswith('{'):
+        job = json.loads(line)
+        dims = job['dims'] if 'dims' in job else [job['width'], job['height']]
+        width, height = parse_dimensions(dims) if isinstance(dims, str) else integer_pair(dims, 'dims')
+        if width < 1 or height < 1:
+            raise ValueError(f'invalid dims {dims}, both must be positive')
+        return {'width': width, 'height': height, 'start': integer_pair(job['start'], 'start'),
+                'closed': bool(job.get('closed', False))}
+
+    width, height, x, y = map(int, line.split())
+    return {'width': width, 'height': height, 'start': [x, y], 'closed': False}
+
+
+def integer_pair(value, name) -> list:
+    """Checks that the <name> of a batch job, <value>, is a list of two integers, and returns it."""
+    if not (isinstance(value, list) and len(value) == 2
+            and all(isinstance(number, int) and not isinstance(number, bool) for number in value)):
+        raise ValueError(f'invalid {name} {json.dumps(value)}, expected a list of two integers')
+    return list(value)
+
+
+def run_solve(arguments, out) -> int:
+    """Runs the solve command, writing one board in the requested format to <out>."""
+    width, height = arguments.dims
+    observer = None
+    if arguments.progress:
+        import progress
+        observer = progress.ProgressLine(delay=0)
+    try:
+        result = solve_job(width, height, arguments.start, arguments.closed, not arguments.no_cache, observer,
+                           arguments.timeout, arguments.max_nodes)
+    except ValueError as error:
+        print(f'error: {error}', file=sys.stderr)
+        return 2
+
+    positions = result['tour'] or result.get('partial')
+    if arguments.save and positions:
+        import tourfile
+        path = [moves.square_index(position, width) for position in positions]
+        tourfile.write_tour(arguments.save, width, height, path,
+                            tourfile.DIRECTIONS if arguments.packed else tourfile.ORDER)
+
+    if arguments.format == 'json':
+        out.write(json.dumps(result) + '\n')
+        return EXIT_STATUS[result['status']]
+    if result['status'] == 'unsolvable':
+        print("No solution exists!", file=out if arguments.format == 'text' else sys.stderr)
+        return EXIT_STATUS[result['status']]
+
+    if result['status'] == 'exhausted':
+        print(f"Gave up before finding a tour; the longest partial tour reached {len(result['partial'])} "
+              f"of {width * height} squares:", file=out if arguments.format == 'text' else sys.stderr)
+    path = [moves.square_index(position, width) for position in positions]
+    if arguments.format == 'text':
+        render.print_board(gameboard.board_from_path(width, height, path), stream=out)
+    elif arguments.format == 'moves':
+        render.write_moves(width, path, out)
+    elif arguments.format == 'csv':
+        render.write_csv(width, height, path, out)
+    else:
+        render.write_pgm(width, height, path, getattr(out, 'buffer', out))
+    return EXIT_STATUS[result['status']]
+
+
+def run_batch(arguments, out) -> int:
+    """Runs the batch command, solving each job read from the input and writing one JSON line per job to <out>.
+
+    Results are written, and flushed, as soon as each job is done. A job that can't be read or solved produces a line
+    with an 'error' instead of stopping the batch.
+    """
+    source = sys.stdin if arguments.input == '-' else open(arguments.input)
+    failures = 0
+    with source:
+        for number, line in enumerate(source, 1):
+            if not line.strip() or line.lstrip().startswith('#'):
+                continue
+            try:
+                job = parse_job(line)
+                result = solve_job(job['width'], job['height'], job['start'], job['closed'], not arguments.no_cache,
+                                   timeout=arguments.timeout, max_nodes=arguments.max_nodes)
+            except (ValueError, KeyError, TypeError, argparse.ArgumentTypeError) as error:
+                result = {'line': number, 'error': str(error)}
+                failures += 1
+            out.write(json.dumps(result) + '\n')
+            out.flush()
+
+    return 1 if failures else 0
+
+
+def run_step(arguments, out) -> int:
+    """Runs the step command, writing the step at which a saved tour visits a square to <out>."""
+    import tourfile
+    try:
+        with tourfile.TourFile(arguments.file) as tour:
+            step = tour.step_at([arguments.x, arguments.y])
+    except (OSError, ValueError, IndexError) as error:
+        print(f'error: {error}', file=sys.stderr)
+        return 2
+
+    out.write(f'{step}\n')
+    return 0 if step else 1
+
+
+def run_map(arguments, out) -> int:
+    """Runs the map command, writing which start squares of a board have a tour to <out>."""
+    import solvability
+    width, height = arguments.dims
+    answers = solvability.solvability_map(width, height, not arguments.no_cache, arguments.max_nodes,
+                                          arguments.workers or None)
+    if arguments.format == 'json':
+        names = {solvability.SOLVABLE: True, solvability.UNSOLVABLE: False, solvability.UNKNOWN: None}
+        out.write(json.dumps({'width': width, 'height': height,
+                              'solvable': [[names[answer] for answer in row] for row in answers]}) + '\n')
+    else:
+        marks = {solvability.SOLVABLE: 'Y', solvability.UNSOLVABLE: 'N', solvability.UNKNOWN: '?'}
+        cell_length = gameboard.cell_size([width, height])
+        render.print_board([[marks[answer].rjust(cell_length) for answer in row] for row in answers], stream=out)
+    return 0
+
+
+def run_serve(arguments, out) -> int:
+    """Runs the serve command, hosting games for clients over TCP until interrupted."""
+    import asyncio
+    import server
+    print(f'serving on {arguments.host}:{arguments.port}', file=sys.stderr)
+    try:
+        asyncio.run(server.run(arguments.host, arguments.port, arguments.idle_timeout, arguments.solve_timeout))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def run_play(arguments, out) -> int:
+    """Runs the interactive game."""
+    import main
+    main.KnightsTour().main_call()
+    return 0
+
+
+def add_budget_arguments(parser) -> None:
+    """Adds the options that limit how long a search may run, which solve and batch share."""
+    parser.add_argument('--timeout', type=float, metavar='SECONDS',
+                        help='give up on a board after this many seconds, and show the longest partial tour found '
+                             f'(default: no limit, or {tours.UNSTITCHED_TIMEOUT:g} for a board with no closed tour)')
+    parser.add_argument('--max-nodes', type=int, metavar='N',
+                        help='give up on a board after trying this many moves, and show the longest partial tour found')
+
+
+def argument_parser() -> argparse.ArgumentParser:
+    """Builds the parser for the command line."""
+    parser = argparse.ArgumentParser(prog='cli.py', description="Find and play knight's tours.")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    solve = commands.add_parser('solve', help='find a tour of one board')
+    solve.add_argument('dims', type=parse_dimensions, help="board size, '<width>x<height>'")
+    solve.add_argument('--start', type=int, nargs=2, default=[1, 1], metavar=('X', 'Y'),
+                       help='Cartesian starting position (default: 1 1)')
+    solve.add_argument('--format', choices=['text', 'json', 'moves', 'csv', 'pgm'], default='text',
+                       help="output format: the numbered board, JSON, one 'x y' line per move, the numbered board as "
+                            "CSV, or a PGM heatmap of the visiting order (default: text)")
+    solve.add_argument('--closed', action='store_true', help='only accept a closed tour')
+    solve.add_argument('--no-cache', action='store_true', help="don't use the on-disk cache of tours")
+    solve.add_argument('--progress', action='store_true', help='show the progress of the search on stderr')
+    solve.add_argument('--save', metavar='FILE', help='also save the tour to FILE, in the format of tourfile')
+    solve.add_argument('--packed', action='store_true',
+                       help='save the tour as 3-bit moves, which is smaller but slower to look squares up in')
+    add_budget_arguments(solve)
+    solve.set_defaults(handler=run_solve)
+
+    batch = commands.add_parser('batch', help='solve many boards, writing one JSON line per board')
+    batch.add_argument('input', nargs='?', default='-',
+                       help="file of jobs, one per line, or '-' for stdin (default: -)")
+    batch.add_argument('--no-cache', action='store_true', help="don't use the on-disk cache of tours")
+    add_budget_arguments(batch)
+    batch.set_defaults(handler=run_batch)
+
+    step = commands.add_parser('step', help='look up the step at which a saved tour visits a square')
+    step.add_argument('file', help='a tour saved by solve --save')
+    step.add_argument('x', type=int, help='Cartesian x of the square')
+    step.add_argument('y', type=int, help='Cartesian y of the square')
+    step.set_defaults(handler=run_step)
+
+    solvable = commands.add_parser('map', help='show which start squares of a board have a tour')
+    solvable.add_argument('dims', type=parse_dimensions, help="board size, '<width>x<height>'")
+    solvable.add_argument('--format', choices=['text', 'json'], default='text', help='output format (default: text)')
+    solvable.add_argument('--no-cache', action='store_true', help="don't use the on-disk cache of tours and maps")
+    solvable.add_argument('--max-nodes', type=int, metavar='N',
+                          help="give up on a square after trying this many moves, and mark it '?'")
+    solvable.add_argument('--workers', type=int, default=1, metavar='N',
+                          help='search the squares in N worker processes, 0 for one per CPU (default: 1)')
+    solvable.set_defaults(handler=run_map)
+
+    serve = commands.add_parser('serve', help='host many games at once for clients speaking JSON lines over TCP')
+    serve.add_argument('--host', default='127.0.0.1', help='address to listen on (default: 127.0.0.1)')
+    serve.add_argument('--port', type=int, default=8765, help='port to listen on (default: 8765)')
+    serve.add_argument('--idle-timeout', type=float, default=15 * 60, metavar='SECONDS',
+                       help='evict games idle for this long (default: 900)')
+    serve.add_argument('--solve-timeout', type=float, default=30.0, metavar='SECONDS',
+                       help='the longest a solve request may search for (default: 30)')
+    serve.set_defaults(handler=run_serve)
+
+    play = commands.add_parser('play', help='play the interactive game')
+    play.set_defaults(handler=run_play)
+
+    return parser
+
+
+def main(argv=None, out=None) -> int:
+    """Runs the command line with the arguments <argv>, writing results to <out>, and returns the exit status.
+
+    The exit status is 0 on success, 1 when there is no tour (or, in a batch, when any job failed), 2 when the
+    arguments are invalid, and 3 when the search ran out of time or moves before it could tell.
+    """
+    arguments = argument_parser().parse_args(argv)
+    return arguments.handler(arguments, out or sys.stdout)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
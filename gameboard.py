@@ -0,0 +1,340 @@
+import copy
+
+import boardarray
+import moves
+
+
+def cell_size(dimensions):
+    """Calculates a cell size based on the dimensions of the given board.
+
+    Args:
+        dimensions (list): a list in the form [int, int] that denotes the dimensions from which to calculate the cell
+        size.
+
+    Return:
+        cell_size (int): The appropriate cell size for a board with dimensions of the given board.
+    """
+    rows = dimensions[1]
+    columns = dimensions[0]
+    size = len(str(rows) + str(columns))
+    return size
+
+
+def game_board(dimensions) -> list:
+    """Returns a nested list matrix with the given dimensions.
+
+    Args:
+        dimensions (list): Dimensions of the board that will be generated; should be in the form [int, int]
+
+    Return:
+        board (nested list): A list of lists, where each internal list is a row on the board whose elements are
+        one or more underscores, denoting an empty spot. This project uses Cartesian coordinates to reference locations on
+        the board as opposed to standard matrix notation, which is why the rows and columns are the second and first
+        entries of the list, respectively, instead of the other way around.
+    """
+    board = []
+    rows = dimensions[1]
+    columns = dimensions[0]
+    cell_length = len(str(rows) + str(columns))
+    row = ['_' * cell_length] * columns
+
+    for _ in range(rows):
+        board.append(copy.deepcopy(row))
+
+    return board
+
+
+def move_is_valid(board, new_position, current_position=None) -> bool:
+    """Checks whether the given move is valid for the given board.
+
+    Makes the following checks:
+        - The coordinates of the given move are both positive integers
+        - There are only two coordinates in the move, x and y
+        - The new position hasn't been visited before; the spot on the board doesn't already contain '*', 'X' or <int>
+        - The coordinates are within the range of the board
+        - The knight can legally move from it's current position to the new position
+
+    Args:
+        board (list): A list of lists, whose internal elements are either underscores, 'X', or '*'.
+                An * or X may be preceded by one or more spaces.
+        new_position (str): A move to be validated, in the form '<x coordinate> <y coordinate>'
+        current_position (list): The x and y location from which the knight will be moving, in the form [int, int]
+    """
+    try:
+        coordinates = new_position.split()
+        x = int(coordinates[0])
+        y = int(coordinates[1])
+    except IndexError:
+        return False
+    except ValueError:
+        return False
+
+    width = len(board[0])
+    on_board = (0 < x <= width) and (0 < y <= len(board)) and (len(coordinates) == 2)
+    if not on_board or not spot_is_open(board, [x, y]):
+        return False
+    if not current_position:
+        return True
+
+    neighbors = moves.neighbor_table(width, len(board))[moves.square_index(current_position, width)]
+    return moves.square_index([x, y], width) in neighbors
+
+
+def spot_is_open(board, position) -> bool:
+    """Checks whether the spot at the given position hasn't been visited; it doesn't contain '*', 'X' or <int>.
+
+    Args:
+        board (list): A list of lists, whose internal elements are either underscores, 'X', '*', or digits.
+                Any of these other than underscores may be preceded by one or more spaces.
+        position (list): A Cartesian position on the board, in the form [x, y].
+    """
+    spot = board[position[1] - 1][position[0] - 1].strip()
+    return spot not in ['*', 'X'] and not spot.isdigit()
+
+
+def possible_next_moves(x, y) -> list:
+    """Gives a list of potential moves from the given coordinates.
+
+    Given an x and y coordinate, gives a list of the eight relative positions in Cartesian coordinates that a chess
+    knight would be able to move to.
+
+    Args:
+        x (int): The x Cartesian coordinate of the knight.
+        y (int): The y Cartesian coordinate of the knight.
+
+    Return:
+        move (nested list): A list of lists, where each internal list is a Cartesian position [x, y]
+    """
+    moves = [
+        [x - 2, y + 1],
+        [x - 1, y + 2],
+        [x + 1, y + 2],
+        [x + 2, y + 1],
+        [x + 2, y - 1],
+        [x + 1, y - 2],
+        [x - 1, y - 2],
+        [x - 2, y - 1]
+    ]
+    return moves
+
+
+def make_move(board, move, character='X') -> list:
+    """Updates the given board with the given move.
+
+    Args:
+        board (list): A list of lists, whose internal elements are either underscores, 'X', or '*'.
+                An * or X may be preceded by one or more spaces.
+        move (list): A Cartesian coordinate in the form [x, y]
+        character (str): The character that will be placed on board at the given move.
+
+    Return:
+        board (list): The same board, but with the given character placed in the given location.
+
+    """
+    spaces = len(str(len(board[0])) + str(len(board)))
+    board[move[1] - 1][move[0] - 1] = (' ' * (spaces - len(character))) + character
+    return board
+
+
+def board_with_warnsdorff_counts(board, current_position) -> list:
+    """Adds potential move counts from future moves onto the board.
+
+    Takes <board>, finds the valid moves from <current_position>, counts the number of possible valid next moves from
+    each one of those valid moves (called the Warnsdorff count), then adds that number to that spot on the board. For
+    instance, if I could move to spot [x, y] from <current_position> and then make 6 more valid moves from [x,
+    y], the board will have a '6' at [x, y].
+
+    Args:
+        board (list): A list of lists, whose internal elements are either underscores, 'X', or '*'.
+                An * or X may be preceded by one or more spaces.
+        current_position (list): The position from which you want to count future moves, in the form of Cartesian
+                coordinates [x, y]
+
+    Return:
+        board_with_counts (list): A game board similar to <board>, but with all of the Warnsdorrf counts (described
+                above) filled in.
+    """
+    width = len(board[0])
+    table = moves.neighbor_table(width, len(board))
+    board_with_counts = copy.deepcopy(board)
+    array_board = boardarray.ArrayBoard.from_board(board)
+
+    for square in table[moves.square_index(current_position, width)]:
+        move = moves.square_position(square, width)
+        if not array_board.is_visited(move):
+            board_with_counts = make_move(board_with_counts, move, str(array_board.degree(move)))
+
+    return board_with_counts
+
+
+def update_warnsdorff_counts(board_with_counts, board, state, previous_position, current_position) -> list:
+    """Moves the Warnsdorff counts on <board_with_counts> from around <previous_position> to around <current_position>.
+
+    Gives the same board as board_with_warnsdorff_counts, but only the spots that can change between two turns are
+    rewritten: the two positions and the spots a knight move away from them. The counts themselves are looked up in
+    the degrees that <state> keeps up to date, so each turn costs the same however large the board is.
+
+    Args:
+        board_with_counts (list): The board_with_counts from the previous turn, which is updated in place. Before the
+                first turn, this can be any copy of <board>.
+        board (list): A list of lists, whose internal elements are either underscores, 'X', or '*'.
+                An * or X may be preceded by one or more spaces.
+        state (solver.TourState): A state that has visited the same spots as <board>.
+        previous_position (list): The position of the knight on the previous turn, [x, y], or [None, None] on the
+                first turn.
+        current_position (list): The position from which you want to count future moves, [x, y].
+
+    Return:
+        board_with_counts (list): <board_with_counts>, with the Warnsdorff counts around <current_position> filled in.
+    """
+    width = len(board[0])
+    table = moves.neighbor_table(width, len(board))
+    current = moves.square_index(current_position, width)
+
+    stale_squares = [current]
+    if None not in previous_position:
+        previous = moves.square_index(previous_position, width)
+        stale_squares += [previous, *table[previous]]
+    for square in stale_squares:
+        x, y = moves.square_position(square, width)
+        board_with_counts[y - 1][x - 1] = board[y - 1][x - 1]
+
+    for square in table[current]:
+        if not state.order[square]:
+            move = moves.square_position(square, width)
+            board_with_counts = make_move(board_with_counts, move, str(state.degree(square)))
+
+    return board_with_counts
+
+
+def warnsdorff_count(board, move) -> int:
+    """Give the number of moves possible if the given move is valid and was played on the board.
+
+    This function takes <board>, which contextually is the current state of the game, and counts how many moves could
+    be played after <move>. A knight can't move back onto the spot it is on, so this is the number of open spots a
+    knight move away from <move>, and <board> doesn't need to be changed or copied to find it. Only those eight spots
+    are looked at, which costs less than reading the whole board into a boardarray.ArrayBoard, so this is the one
+    check that doesn't use one; board_with_warnsdorff_counts, which counts several moves, does.
+
+    Args:
+        board (list): A list of lists, whose internal elements are either underscores, 'X', or '*'.
+                An * or X may be preceded by one or more spaces.
+        move (list): Cartesian coordinates of the form [x, y]
+
+    Return:
+        warnsdorff_number (int): The number of moves that can be played after <move> has been played on <board>
+    """
+    width = len(board[0])
+    table = moves.neighbor_table(width, len(board))
+
+    warnsdorff_number = 0
+    for square in table[moves.square_index(move, width)]:
+        if spot_is_open(board, moves.square_position(square, width)):
+            warnsdorff_number += 1
+
+    return warnsdorff_number
+
+
+def game_is_won(board) -> bool:
+    """Checks if the game is won and exits if so.
+
+    Checks for a win by determining if there are any spaces left on the board that haven't been previously visited (*)
+    other than the position that the knight is currently in (X).
+
+    Args:
+        board (list): A list of lists, whose internal elements are either underscores, 'X', or '*'.
+                An * or X may be preceded by one or more spaces.
+
+    """
+    return boardarray.ArrayBoard.from_board(board).is_won()
+
+
+def board_is_dead_end(board_with_counts) -> bool:
+    """Checks for a dead end by looking for Warnsdorff counts in any spots.
+
+    A board that has been passed through the warnsdorff_count function is meant to be used here.
+    If there are any possible moves remaining, a Warnsdorff number will be present in the available spot. Those spots
+    are exactly the unvisited ones around the 'X', so this is answered by boardarray.ArrayBoard.is_dead_end.
+
+    Args:
+        board_with_counts (list): A list of lists, whose internal elements are either underscores, 'X', '*', or an integer
+                denoting how many moves could be made from that position. An * or X may be preceded by one or more
+                spaces.
+    """
+    array_board = boardarray.ArrayBoard.from_board(board_with_counts)
+    return array_board.knight is None or array_board.is_dead_end(array_board.knight)
+
+
+def spots_visited(board):
+    """Counts the number of spots the knight has occupied (at any point) on the given board.
+
+    Args:
+        board (list): A list of lists, whose internal elements are either underscores, 'X', or '*'.
+                An * or X may be preceded by one or more spaces.
+
+    Return:
+        count (int): The count of spots on the board that the knight has already visited.
+    """
+    return boardarray.ArrayBoard.from_board(board).spots_visited()  # The 'X' the knight is on counts as well.
+
+
+def board_from_path(width, height, path) -> list:
+    """Returns a board whose spots are numbered in the order they are visited by <path>.
+
+    Args:
+        width (int): The width of the board.
+        height (int): The height of the board.
+        path (list): The indices (see moves.square_index) of the squares of a tour, in order.
+
+    Return:
+        board (list): A board like those made by game_board, with the spots visited by <path> filled with integers
+        (the order in which they were played), and the rest left as underscores.
+    """
+    cell_length = len(str(height) + str(width))
+    flat = ['_' * cell_length] * (width * height)
+    for step, square in enumerate(path, 1):
+        flat[square] = str(step).rjust(cell_length)
+
+    return [flat[row_start:row_start + width] for row_start in range(0, width * height, width)]
+
+
+def board_is_solved(board) -> bool:
+    """Determines whether the board has been solved by the computer.
+
+    If the board is full of numbers, returns True, and otherwise False.
+
+    Args:
+        board (list): A list of lists, whose internal elements are either underscores, or digits.
+                A digit may be preceded by one or more spaces."""
+    for row in board:
+        for spot in row:
+            if not spot.strip().isdigit():
+                return False
+
+    return True
+
+
+def next_algorithm_character(board):
+    """Returns a string that is numerically one greater than the previous move played.
+
+    This is part of the algorithm to determine if a board is winnable or not, and is not used in the case that the user
+    opts not to attempt the board. If a move has yet to be played on <board>, it returns '1'.
+
+    Args:
+        board (list): A list of lists, whose internal elements are either underscores, or digits.
+                A digit may be preceded by one or more spaces.
+
+    Return:
+        character (str): A string that is one more than the maximum integer on the board.
+    """
+    played_integers = []
+    for row in board:
+        for spot in row:
+            if spot.strip().isdigit():
+                played_integers.append(int(spot.strip()))
+
+    if not played_integers:
+        return '1'
+    else:
+        character = str(max(played_integers) + 1)
+        return character
@@ -0,0 +1,82 @@
+import cache
+import moves
+import solver
+
+# The most seconds a hint searches for before giving up, so the player is never kept waiting for long.
+DEFAULT_TIMEOUT = 2.0
+
+
+class HintEngine:
+    """Suggests moves for a game in progress, and finishes the tour for the player, from wherever the knight is.
+
+    A hint is the next square of a tour that starts with the squares the game has visited so far, found by
+    solver.complete_within from the game's path rather than from an empty board. The tour found is kept as a lookahead:
+    as long as the player follows it, every later hint and finish is read straight from it, without any search, and
+    a new one is only searched for once the player leaves it. Before the first search, the tour from the game's
+    starting square in cache.default_cache is used as the lookahead, since the game has looked it up already.
+
+    A path that has been proven to have no tour is kept as well, since no path that starts with it has one either, so
+    once the player has wandered off every tour, the hints say so without searching again at every move.
+
+    Attributes:
+        width (int): The width of the board.
+        height (int): The height of the board.
+        timeout (float or None): The most seconds each search may take, or None for no limit.
+        use_cache (bool): Whether to look up the tour from the starting square in the on-disk cache of tours.
+        searches (int): The number of searches run so far, which stays the same while hints come from the lookahead.
+    """
+
+    def __init__(self, width, height, timeout=DEFAULT_TIMEOUT, use_cache=True):
+        self.width = width
+        self.height = height
+        self.timeout = timeout
+        self.use_cache = use_cache
+        self.searches = 0
+
+        self._tour = None
+        self._dead_end = None
+        self._checked_cache = not use_cache
+
+    def completion(self, path) -> solver.SolveResult:
+        """Finds a tour that starts with <path>, the squares visited so far.
+
+        Args:
+            path (list): The indices (see moves.square_index) of the squares the knight has visited, in order.
+
+        Return:
+            result (solver.SolveResult): SOLVED with the whole tour, UNSOLVABLE if there is no tour that starts with
+            <path>, or EXHAUSTED with the longest path the search reached if it ran out of time first.
+        """
+        path = list(path)
+        if not self._checked_cache:
+            self._checked_cache = True
+            tour_cache = cache.default_cache()
+            start = moves.square_position(path[0], self.width)
+            self._tour = (tour_cache.get(self.width, self.height, start) if tour_cache else None) or None
+
+        if self._tour is not None and self._tour[:len(path)] == path:
+            return solver.SolveResult(solver.SOLVED, self._tour)
+        if self._dead_end is not None and path[:len(self._dead_end)] == self._dead_end:
+            return solver.SolveResult(solver.UNSOLVABLE, [])
+
+        state = solver.TourState(self.width, self.height)
+        state.follow(path)
+        result = solver.complete_within(state, self.timeout)
+        self.searches += 1
+        if result.solved:
+            self._tour = result.path
+        elif not result.exhausted:
+            self._dead_end = path
+        return result
+
+    def hint(self, path) -> tuple:
+        """Suggests the next move of the game whose visited squares are <path>.
+
+        Return:
+            hint (tuple): (status, square), where status is that of completion and square is the index of the square
+            to move to next: the next square of a tour if one was found, the next square of the longest path the
+            search reached if it ran out of time, which is only a guess, or None if there is no tour or no move.
+        """
+        result = self.completion(path)
+        square = result.path[len(path)] if len(result.path) > len(path) else None
+        return result.status, square
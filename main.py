@@ -1,4 +1,8 @@
-import helpers
+import copy
+
+import gameboard
+import prompts
+import render
 
 
 class KnightsTour:
@@ -11,66 +15,133 @@ class KnightsTour:
 
         self.board = []
         self.board_with_counts = []
+        self.tour = None
         self.cell_size = 0
         self.possible_moves = []
+        self.hints = None
 
     def main_call(self):
         self._set_board_dimension()
         self._set_cell_size()
         self._set_board()
         self._set_starting_position()
-        wants_to_try = helpers.user_wants_to_attempt()
+        wants_to_try = prompts.user_wants_to_attempt()
 
-        if helpers.respond_to_user(wants_to_try, self.board, self.starting_position):
+        if prompts.respond_to_user(wants_to_try, self.board, self.starting_position):
             return
 
+        # Only the game itself needs the solver, so a solution shown straight from the cache never loads it.
+        import hints
+        import solver
+        self.tour = solver.TourState(self.board_dimensions[0], self.board_dimensions[1])
         self._update_board(self.board, self.starting_position, 'X')
         self.current_position = self.starting_position
+        self.hints = hints.HintEngine(self.board_dimensions[0], self.board_dimensions[1])
+        print("Enter 'hint' for a suggested move, or 'finish' to see the rest of a tour from where your knight is.")
         while True:
             self._update_board_with_counts(self.board, self.current_position)
-            helpers.print_board(self.board_with_counts, [self.board_dimensions[1], self.board_dimensions[0]])
+            render.print_board(self.board_with_counts)
 
-            if helpers.game_is_won(self.board):
+            if self.tour.is_complete():
                 print("What a great tour! Congratulations!")
                 return
-            if helpers.board_is_dead_end(self.board_with_counts):
-                print(f"No more possible moves! Your knight visited {helpers.spots_visited(self.board)} squares!")
+            if self.tour.degree(self.tour.path[-1]) == 0:
+                print(f"No more possible moves! Your knight visited {len(self.tour.path)} squares!")
                 return
 
+            move = self._next_move()
+            if move is None:
+                return
             self.previous_position = self.current_position
-            self.current_position = helpers.new_move(self.board, self.current_position)
-            self.board = helpers.make_move(self.board, self.previous_position, '*')
-            self.board = helpers.make_move(self.board, self.current_position, 'X')
+            self.current_position = move
+            self._update_board(self.board, self.previous_position, '*')
+            self._update_board(self.board, self.current_position, 'X')
+
+    def _next_move(self):
+        """Asks the user for their next move, answering any requests for hints along the way.
+
+        Return:
+            move (list or None): The move in Cartesian coordinates, [x, y], or None if the user asked for the rest of
+            the tour to be shown, which ends the game.
+        """
+        while True:
+            answer = prompts.new_move(self.board, self.current_position, commands=('hint', 'finish'))
+            if answer == 'hint':
+                self._show_hint()
+            elif answer == 'finish':
+                self._show_finish()
+                return None
+            else:
+                return answer
+
+    def _show_hint(self):
+        """Prints the move the hint engine suggests from the current position."""
+        import solver
+        status, square = self.hints.hint(self.tour.path)
+        if status == solver.UNSOLVABLE:
+            print("There's no full tour from here any more.")
+        elif square is None:
+            print("No full tour was found from here in time.")
+        elif status == solver.SOLVED:
+            print("Try moving to {} {}.".format(*self.tour.position(square)))
+        else:
+            print("No full tour was found from here in time, but {} {} looks most promising.".format(
+                *self.tour.position(square)))
+
+    def _show_finish(self):
+        """Prints the board with the rest of a tour from the current position filled in, if there is one."""
+        import solver
+        result = self.hints.completion(self.tour.path)
+        if not result.solved:
+            print("There's no full tour from here any more." if result.status == solver.UNSOLVABLE else
+                  "No full tour was found from here in time.")
+            return
+        print("\nHere's how your tour could finish!")
+        render.print_board(gameboard.board_from_path(self.tour.width, self.tour.height, result.path))
 
     def _set_board_dimension(self):
         """Sets the board_dimension attribute."""
-        self.board_dimensions = helpers.board_dimensions()
+        self.board_dimensions = prompts.board_dimensions()
         return
 
     def _set_cell_size(self):
         """Sets the cell_size attribute."""
-        self.cell_size = helpers.cell_size(self.board_dimensions)
+        self.cell_size = gameboard.cell_size(self.board_dimensions)
 
     def _set_board(self):
-        """Sets the board using the previously validated dimensions."""
-        self.board = helpers.game_board(self.board_dimensions)
+        """Sets the board using the previously validated dimensions. The tour state that tracks it is set once the game
+        starts."""
+        self.board = gameboard.game_board(self.board_dimensions)
+        self.board_with_counts = copy.deepcopy(self.board)
         return
 
     def _set_starting_position(self):
         """Sets the starting_position attribute via user input."""
-        self.starting_position = helpers.starting_position(self.board)
+        self.starting_position = prompts.starting_position(self.board)
         return
 
     def _update_board(self, board, move, character):
-        """Updates the game board with the given character at the specified move."""
-        self.board = helpers.make_move(board, move, character)
+        """Updates the game board with the given character at the specified move.
+
+        The knight arriving on a spot ('X') is also recorded in the tour state; marking the spot it left ('*') doesn't
+        change which spots have been visited.
+        """
+        self.board = gameboard.make_move(board, move, character)
+        if character == 'X':
+            self.tour.visit(self.tour.square(move))
         return
 
     def _update_board_with_counts(self, board, current_position):
-        """Updates the board_with_counts attribute using the current board."""
-        self.board_with_counts = helpers.board_with_warnsdorff_counts(board, current_position)
+        """Updates the board_with_counts attribute using the current board.
+
+        Only the counts around the previous and current positions are rewritten, using the Warnsdorff counts kept by
+        the tour state, rather than rebuilding the whole board every turn.
+        """
+        self.board_with_counts = gameboard.update_warnsdorff_counts(self.board_with_counts, board, self.tour,
+                                                                  self.previous_position, current_position)
         return
 
 
-game = KnightsTour()
-game.main_call()
+if __name__ == '__main__':
+    game = KnightsTour()
+    game.main_call()
@@ -0,0 +1,103 @@
+from functools import lru_cache
+
+# The eight knight moves as (dx, dy) offsets, in the same order as gameboard.possible_next_moves.
+KNIGHT_MOVES = ((-2, 1), (-1, 2), (1, 2), (2, 1), (2, -1), (1, -2), (-1, -2), (-2, -1))
+
+
+def square_index(position, width) -> int:
+    """Returns the index of the Cartesian position [x, y] in a flat, row-major array for a board <width> squares wide.
+
+    The square at [x, y] has index (y - 1) * width + (x - 1), so the squares of row y of a board made by
+    gameboard.game_board are stored in order, one row after another.
+    """
+    return (position[1] - 1) * width + (position[0] - 1)
+
+
+def square_position(square, width) -> list:
+    """Returns the Cartesian position [x, y] of the square with the given index on a board <width> squares wide."""
+    return [square % width + 1, square // width + 1]
+
+
+@lru_cache(maxsize=16)
+def neighbor_table(width, height) -> tuple:
+    """Returns the knight-move neighbors of every square of a <width> by <height> board.
+
+    The table is built once per board size and then shared, so the algorithm, the Warnsdorff counts and the move
+    validation never need to generate and bounds-check the eight knight moves themselves. The most recently used
+    sizes are kept, up to the maxsize of the cache.
+
+    Return:
+        table (tuple): A tuple with one entry per square index (see square_index), each of which is a tuple of the
+        indices of the squares on the board that a knight on that square could move to, in the order of KNIGHT_MOVES.
+    """
+    table = []
+    for y in range(height):
+        for x in range(width):
+            neighbors = tuple((y + dy) * width + x + dx for dx, dy in KNIGHT_MOVES
+                              if 0 <= x + dx < width and 0 <= y + dy < height)
+            table.append(neighbors)
+
+    return tuple(table)
+
+
+def pack_directions(path, width) -> bytes:
+    """Packs the moves of a tour into 3 bits each.
+
+    Each move from one square of <path> to the next is written as its index in KNIGHT_MOVES, and eight of these codes
+    are packed into every three bytes, lowest bits first. The first square isn't stored, so it has to be known when the
+    moves are unpacked.
+
+    Args:
+        path (list): The indices (see square_index) of the squares of the tour, in order.
+        width (int): The width of the board.
+
+    Return:
+        data (bytes): The packed moves, ceil(3 * (len(path) - 1) / 8) bytes long.
+    """
+    codes = {move: code for code, move in enumerate(KNIGHT_MOVES)}
+    packed = bytearray()
+    group = 0
+    shift = 0
+    previous_y, previous_x = divmod(path[0], width) if path else (0, 0)
+    for square in path[1:]:
+        y, x = divmod(square, width)
+        group |= codes[(x - previous_x, y - previous_y)] << shift
+        previous_x = x
+        previous_y = y
+        shift += 3
+        if shift == 24:
+            packed += group.to_bytes(3, 'little')
+            group = 0
+            shift = 0
+    if shift:
+        packed += group.to_bytes((shift + 7) // 8, 'little')
+
+    return bytes(packed)
+
+
+def unpack_directions(data, first, length, width) -> list:
+    """Unpacks a tour packed by pack_directions.
+
+    Args:
+        data (bytes): The packed moves.
+        first (int): The index of the first square of the tour.
+        length (int): The number of squares in the tour.
+        width (int): The width of the board.
+
+    Return:
+        path (list): The indices of the squares of the tour, in order.
+    """
+    path = [first]
+    y, x = divmod(first, width)
+    remaining = length - 1
+    for start in range(0, len(data), 3):
+        group = int.from_bytes(data[start:start + 3], 'little')
+        for _ in range(min(8, remaining)):
+            dx, dy = KNIGHT_MOVES[group & 7]
+            x += dx
+            y += dy
+            path.append(y * width + x)
+            group >>= 3
+        remaining -= 8
+
+    return path
@@ -0,0 +1,137 @@
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from multiprocessing import Manager
+
+import solver
+
+# How many moves a worker searches between checks of whether another worker has already found a tour.
+CHECK_INTERVAL = 20_000
+
+
+def subtree_prefixes(width, height, start, depth, warnsdorff=True) -> list:
+    """Splits the search from <start> into the subtrees below every sequence of <depth> moves.
+
+    Args:
+        width (int): The width of the board.
+        height (int): The height of the board.
+        start (list): The Cartesian position [x, y] of the first square of the tour.
+        depth (int): The number of moves after <start> in each prefix. Prefixes that reach a dead end or finish the
+                tour in fewer moves are kept as they are.
+        warnsdorff (bool): Whether to list the prefixes in Warnsdorff order, so the most promising come first.
+
+    Return:
+        prefixes (list): Paths of square indices, each starting with <start>, whose subtrees together make up the whole
+        search.
+    """
+    state = solver.TourState(width, height)
+    state.visit(state.square(start))
+    prefixes = []
+
+    def expand(remaining):
+        candidates = [square for square in state.neighbors(state.path[-1]) if not state.order[square]]
+        if warnsdorff:
+            candidates = solver.warnsdorff_order(state, candidates)
+        if remaining == 0 or not candidates:
+            prefixes.append(list(state.path))
+            return
+        for square in candidates:
+            state.visit(square)
+            expand(remaining - 1)
+            state.undo()
+
+    expand(depth)
+    return prefixes
+
+
+def search_subtree(width, height, prefix, warnsdorff, stop_event) -> list:
+    """Searches the subtree of tours that begin with <prefix>, in a worker process.
+
+    The search is run CHECK_INTERVAL moves at a time, and given up as soon as <stop_event> is set.
+
+    Return:
+        path (list or None): The squares of a tour beginning with <prefix>, an empty list if there is none, or None if
+        the search was stopped before it finished.
+    """
+    state = solver.TourState(width, height)
+    for square in prefix:
+        state.visit(square)
+
+    search = solver.TourSearch(state, warnsdorff)
+    while True:
+        if stop_event.is_set():
+            return None
+        solved = search.run(CHECK_INTERVAL)
+        if solved is not None:
+            return list(state.path) if solved else []
+
+
+def parallel_solve(width, height, start, workers=None, depth=1, warnsdorff=True) -> list:
+    """Searches for a tour with the subtrees of the search shared out between worker processes.
+
+    The subtrees below every sequence of <depth> moves from <start> are searched at the same time, and as soon as one
+    of them gives a tour, every other worker is told to stop and the subtrees that haven't been started are cancelled.
+    A board that solver.solve would stitch together is handed to it directly, since that doesn't need a search.
+
+    Args:
+        width (int): The width of the board.
+        height (int): The height of the board.
+        start (list): The Cartesian position [x, y] of the first square of the tour.
+        workers (int): The number of worker processes, or None for one per CPU.
+        depth (int): The number of moves that make up the prefix of each subtree.
+        warnsdorff (bool): Whether to search in Warnsdorff order.
+
+    Return:
+        path (list): The indices of the squares of a tour, in order, or an empty list if there is no tour from <start>.
+    """
+    if solver.stitched.should_stitch(width, height):
+        return solver.solve(width, height, start, warnsdorff).path
+
+    prefixes = subtree_prefixes(width, height, start, depth, warnsdorff)
+    for prefix in prefixes:
+        if len(prefix) == width * height:
+            return prefix
+
+    with Manager() as manager, ProcessPoolExecutor(max_workers=workers) as executor:
+        stop_event = manager.Event()
+        pending = {executor.submit(search_subtree, width, height, prefix, warnsdorff, stop_event)
+                   for prefix in prefixes}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                path = future.result()
+                if path:
+                    stop_event.set()
+                    for other in pending:
+                        other.cancel()
+                    return path
+
+    return []
+
+
+def solve_start(width, height, start, max_nodes, warnsdorff):
+    """Searches for a tour from a single start square within <max_nodes>, in a worker process."""
+    return solver.solve_within(width, height, start, max_nodes=max_nodes, warnsdorff=warnsdorff)
+
+
+def solve_starts(width, height, starts, max_nodes=None, workers=None, warnsdorff=True) -> list:
+    """Searches for a tour from each of many start squares of a <width> by <height> board, all at once.
+
+    Each start square is searched by solver.solve_within as a task of its own, shared out between the worker
+    processes. This is how solvability.solvability_map shares out the squares it has to search, and it leaves caching
+    the answers to it.
+
+    Args:
+        width (int): The width of the board.
+        height (int): The height of the board.
+        starts (list): The Cartesian positions [x, y] to search from.
+        max_nodes (int): The most moves to try from each start, or None to search each one to the end.
+        workers (int): The number of worker processes, or None for one per CPU.
+        warnsdorff (bool): Whether to search in Warnsdorff order.
+
+    Return:
+        results (list): The solver.SolveResult of each start, in the order of <starts>.
+    """
+    if not starts:
+        return []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(solve_start, width, height, start, max_nodes, warnsdorff) for start in starts]
+        return [future.result() for future in futures]
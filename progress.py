@@ -0,0 +1,114 @@
+import sys
+import time
+
+# How many moves a watched search tries between reports to its observer.
+DEFAULT_INTERVAL = 50_000
+
+
+class SearchObserver:
+    """Watches a solver.TourSearch, and is told when it starts, how it is getting on, and when it finishes.
+
+    The search reports to its observer every <interval> moves rather than after every move, so watching a search costs
+    next to nothing. Subclasses override started, progress and finished; all three do nothing here, apart from keeping
+    the time so that elapsed and nodes_per_second can be worked out.
+
+    Attributes:
+        interval (int): How many moves the search tries between calls to progress.
+        started_at (float or None): The time.perf_counter() at which the search started, or None before it has.
+    """
+
+    def __init__(self, interval=DEFAULT_INTERVAL):
+        self.interval = interval
+        self.started_at = None
+
+    def started(self, search) -> None:
+        """Called once, before <search> tries its first move."""
+        self.started_at = time.perf_counter()
+
+    def progress(self, search) -> None:
+        """Called every <interval> moves while <search> is still running."""
+
+    def finished(self, search) -> None:
+        """Called once <search> has found a tour, or proven that there is none."""
+
+    def elapsed(self) -> float:
+        """Returns the number of seconds since the search started."""
+        return time.perf_counter() - self.started_at if self.started_at is not None else 0.0
+
+    def nodes_per_second(self, search) -> float:
+        """Returns the average number of moves <search> has tried per second since it started."""
+        elapsed = self.elapsed()
+        return search.nodes / elapsed if elapsed > 0 else 0.0
+
+    def snapshot(self, search) -> dict:
+        """Returns the counters of <search> as they are now.
+
+        Return:
+            counters (dict): The nodes tried, the current and deepest depths reached, the backtracks, the seconds since
+            the search started and the nodes tried per second.
+        """
+        return {
+            'nodes': search.nodes,
+            'depth': search.depth,
+            'max_depth': search.max_depth,
+            'backtracks': search.backtracks,
+            'elapsed': self.elapsed(),
+            'nodes_per_second': self.nodes_per_second(search),
+        }
+
+
+class CallbackObserver(SearchObserver):
+    """Passes the counters of a search (see SearchObserver.snapshot) to a plain function.
+
+    <callback> is called as callback(event, counters), where event is 'started', 'progress' or 'finished'.
+    """
+
+    def __init__(self, callback, interval=DEFAULT_INTERVAL):
+        super().__init__(interval)
+        self.callback = callback
+
+    def started(self, search) -> None:
+        super().started(search)
+        self.callback('started', self.snapshot(search))
+
+    def progress(self, search) -> None:
+        self.callback('progress', self.snapshot(search))
+
+    def finished(self, search) -> None:
+        self.callback('finished', self.snapshot(search))
+
+
+class ProgressLine(SearchObserver):
+    """Keeps a single line on the terminal up to date with the progress of a search.
+
+    Nothing is written until the search has run for <delay> seconds, so quick searches stay silent, and the line is
+    rewritten in place (with a carriage return) at most every <refresh> seconds. When the search finishes, the line is
+    cleared again, if one was written.
+    """
+
+    def __init__(self, stream=None, delay=1.0, refresh=0.2, interval=DEFAULT_INTERVAL):
+        super().__init__(interval)
+        self.stream = stream or sys.stderr
+        self.delay = delay
+        self.refresh = refresh
+        self._written = 0
+        self._last_write = 0.0
+
+    def progress(self, search) -> None:
+        now = self.elapsed()
+        if now < self.delay or now - self._last_write < self.refresh:
+            return
+
+        self._last_write = now
+        area = search.state.width * search.state.height
+        line = (f'searching: depth {search.depth}/{area} (max {search.max_depth}), {search.nodes:,} nodes, '
+                f'{search.backtracks:,} backtracks, {self.nodes_per_second(search):,.0f} nodes/s, {now:.1f}s')
+        self.stream.write('\r' + line.ljust(self._written))
+        self.stream.flush()
+        self._written = len(line)
+
+    def finished(self, search) -> None:
+        if self._written:
+            self.stream.write('\r' + ' ' * self._written + '\r')
+            self.stream.flush()
+            self._written = 0
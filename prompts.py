@@ -0,0 +1,126 @@
+import gameboard
+import render
+import tours
+
+
+def board_dimensions() -> list:
+    """Returns a list of two integers that have been confirmed to be valid board dimensions."""
+    dimensions = input("Enter your board dimensions: ")
+    while not dimensions_are_valid(dimensions):
+        print("Invalid dimensions!")
+        dimensions = input("Enter your board dimensions: ")
+
+    dimensions = list(map(int, dimensions.split()))
+    return dimensions
+
+
+def dimensions_are_valid(dimensions) -> bool:
+    """Checks whether the given board dimensions are valid.
+
+    Args:
+        dimensions (str): '<dimension 1> <dimension 2>'
+    """
+    try:
+        x = int(dimensions[0])
+        y = int(dimensions[-1])
+        is_valid = (x > 0) and (y > 0) and (len(dimensions.split()) == 2)
+        return is_valid
+    except IndexError:
+        return False
+    except ValueError:
+        return False
+
+
+def starting_position(board) -> list:
+    """Returns the starting position for the knight on the board.
+
+    Args:
+        board (list): A list of lists, whose internal elements are either underscores, 'X', or '*'.
+            An * or X may be preceded by one or more spaces.
+
+    Return: current_position (list): A list of two integers, representing the x and y Cartesian coordinates of the
+    knight's starting location on the board.
+    """
+    xy = input("Enter the knight's starting position (space-separated integers): ")
+    while not gameboard.move_is_valid(board, xy):
+        print("Invalid position!")
+        xy = input("Enter the knight's starting position (space-separated integers): ")
+
+    current_position = list(map(int, xy.split()))
+    return current_position
+
+
+def new_move(board, current_position, commands=()) -> list:
+    """Returns a new move, specified by the user, to be played on the given board from the current_position.
+
+    Args:
+        board (list): A list of lists, whose internal elements are either underscores, 'X', or '*'.
+                An * or X may be preceded by one or more spaces.
+        current_position (list): Cartesian position [x, y] from which a move will be made.
+        commands (tuple): Words the user may enter instead of a move, such as 'hint'.
+
+    Return:
+        move (list or str): A move in Cartesian coordinates, [x, y], or the one of <commands> the user entered.
+    """
+    xy = input("Enter your next move: ")
+    while xy.strip() not in commands and not gameboard.move_is_valid(board, xy, current_position):
+        print("Invalid move! ", end='')
+        xy = input("Enter your next move: ")
+
+    if xy.strip() in commands:
+        return xy.strip()
+    move = list(map(int, xy.split()))
+    return move
+
+
+def user_wants_to_attempt() -> bool:
+    """Returns a boolean to determine if the user wants to attempt to solve the board, or if the computer will try."""
+    answer = input("Do you want to try the puzzle? (y/n):\n")
+    while answer not in ['y', 'n']:
+        print("Invalid input!")
+        answer = input("Do you want to try the puzzle? (y/n):\n")
+
+    return answer == 'y'
+
+
+def respond_to_user(wants_to_try, board, start_position, show_progress=True) -> bool:
+    """Prints the appropriate information based on whether or not the user wants to try the puzzle.
+
+    Args:
+        wants_to_try (bool): True if the user wants to attempt the board, False if they do not.
+        board (list): A list of lists, whose internal elements should only be underscores, as this board should not have
+                been played on yet.
+        start_position (list): A starting position in Cartesian coordinates given previously by the user, [x, y].
+        show_progress (bool): Whether to show a progress line (see progress.ProgressLine) if the search takes a while.
+
+    Return:
+        boolean: If the user does not want to try to solve the board from the starting position, the user will
+    either be shown the solution or told that there is no solution. If the user does want to try the board but there
+    is no solution, they will be notified. These cases will return True. If the user wants to try the board,
+    and it does have a solution, False will be returned, since the user was not given any immediate information as to
+    the nature of the solution.
+    """
+    observer = None
+    if show_progress:
+        import progress
+        observer = progress.ProgressLine()
+    width = len(board[0])
+    height = len(board)
+    timeout = tours.default_timeout(width, height)
+    if timeout is None:
+        result_board = tours.winning_board(board, start_position, observer=observer)
+    else:
+        result = tours.winning_result(width, height, start_position, timeout, observer=observer)
+        if result.exhausted:
+            print(f"No solution was found within {timeout:g} seconds!")
+            return True
+        result_board = gameboard.board_from_path(width, height, result.path) if result.solved else []
+    if wants_to_try and result_board:
+        return False
+
+    if not result_board:
+        print("No solution exists!")
+    elif result_board:
+        print("\nHere's the solution!")
+        render.print_board(result_board)
+    return True
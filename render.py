@@ -0,0 +1,140 @@
+import sys
+from array import array
+
+# How many rows of a board, and how many squares of a move list, are written to the output at a time.
+CHUNK_ROWS = 256
+CHUNK_SQUARES = 4096
+
+
+def board_lines(board):
+    """Yields the lines of the text picture of <board>, as print_board shows it, without line breaks.
+
+    The top row of the picture is the last row of <board> (the highest y), and the rows and columns are numbered along
+    the left and bottom edges. The shape is taken from <board> itself, so boards of any width and height come out
+    right, and the numbers stay lined up with their rows and columns however many digits they have.
+
+    Args:
+        board (list): A list of lists of spots, as made by gameboard.game_board, each as long as its cell size.
+    """
+    rows = len(board)
+    columns = len(board[0])
+    cell_length = len(str(rows) + str(columns))
+    label_length = len(str(rows))
+    border = ' ' * label_length + '-' * (columns * (cell_length + 1) + 3)
+
+    yield border
+    for i in reversed(range(rows)):
+        yield f'{i + 1:>{label_length}}| {" ".join(board[i])} |'
+    yield border
+    yield ' ' * (label_length + 2) + ' '.join(str(i + 1).rjust(cell_length) for i in range(columns))
+
+
+def write_board(board, stream=None) -> None:
+    """Writes the text picture of <board> (see board_lines) to <stream>, or to stdout.
+
+    The lines are joined into one string for every CHUNK_ROWS rows and written with a single call, rather than with
+    one print per row, so even boards with thousands of rows are written quickly and with little memory.
+    """
+    stream = stream or sys.stdout
+    chunk = []
+    for line in board_lines(board):
+        chunk.append(line)
+        if len(chunk) == CHUNK_ROWS:
+            chunk.append('')
+            stream.write('\n'.join(chunk))
+            chunk = []
+    chunk.append('')
+    stream.write('\n'.join(chunk))
+
+
+def board_text(board) -> str:
+    """Returns the text picture of <board> (see board_lines) as a single string, ending with a line break."""
+    return '\n'.join(board_lines(board)) + '\n'
+
+
+def print_board(board, dimensions=None, *, stream=None) -> None:
+    """Prints the given board with appropriate formatting.
+
+    The board is written by write_board, a few hundred rows at a time rather than one print per row. Its
+    dimensions are taken from <board> itself, so boards that aren't square can't be printed with their rows and
+    columns swapped.
+
+    Args:
+        board (list): A list of lists, whose internal elements are either underscores, 'X', or '*'.
+                An * or X may be preceded by one or more spaces.
+        dimensions (list): Ignored. Boards used to be printed with their dimensions, [rows, columns], given here, and
+                calls that still give them keep working.
+        stream: The file to print to, or None for stdout. It can only be given by name, so that it is never taken
+                for <dimensions>.
+    """
+    if dimensions is not None and not (isinstance(dimensions, (list, tuple)) and len(dimensions) == 2):
+        raise TypeError('print_board takes the board and, optionally, its dimensions as [rows, columns]; give the '
+                        'stream to print to as stream=')
+    write_board(board, stream)
+
+
+def visit_order(width, height, path) -> array:
+    """Returns the step (counting from 1) at which <path> visits every square of a <width> by <height> board.
+
+    Return:
+        order (array): One entry per square index (see moves.square_index), 0 for squares <path> doesn't visit.
+    """
+    order = array('I', bytes(4 * width * height))
+    for step, square in enumerate(path, 1):
+        order[square] = step
+    return order
+
+
+def write_moves(width, path, stream=None) -> None:
+    """Writes the squares of <path> to <stream>, or to stdout, one 'x y' position per line, in the order visited."""
+    stream = stream or sys.stdout
+    for start in range(0, len(path), CHUNK_SQUARES):
+        stream.write(''.join(f'{square % width + 1} {square // width + 1}\n'
+                             for square in path[start:start + CHUNK_SQUARES]))
+
+
+def write_csv(width, height, path, stream=None) -> None:
+    """Writes the step at which <path> visits each square to <stream>, or to stdout, as comma-separated values.
+
+    The rows are written top to bottom as print_board shows them, from y = <height> down to y = 1, and squares that
+    aren't visited are left empty.
+    """
+    stream = stream or sys.stdout
+    order = visit_order(width, height, path)
+    chunk = []
+    for row_start in reversed(range(0, width * height, width)):
+        chunk.append(','.join(str(step) if step else '' for step in order[row_start:row_start + width]))
+        if len(chunk) == CHUNK_ROWS:
+            chunk.append('')
+            stream.write('\n'.join(chunk))
+            chunk = []
+    chunk.append('')
+    stream.write('\n'.join(chunk))
+
+
+def write_pgm(width, height, path, stream=None) -> None:
+    """Writes a heatmap of the order in which <path> visits the squares to <stream>, as a binary PGM image.
+
+    Each square is one pixel, laid out as print_board shows the board, with y = <height> at the top. Squares that
+    aren't visited are black, and the rest get lighter the later they are visited, up to white for the last one. Boards
+    of up to 65535 squares get a distinct shade for every step; larger ones share each shade between neighbouring steps.
+
+    Args:
+        width (int): The width of the board.
+        height (int): The height of the board.
+        path (list): The indices (see moves.square_index) of the squares of a tour, in order.
+        stream: A binary file to write to, or None for the binary buffer of stdout.
+    """
+    stream = stream or sys.stdout.buffer
+    area = width * height
+    shades = max(1, min(area, 65535))
+    pixels = array('H' if shades > 255 else 'B', bytes(area * (2 if shades > 255 else 1)))
+    for step, square in enumerate(path, 1):
+        y, x = divmod(square, width)
+        pixels[(height - 1 - y) * width + x] = (step * shades + area - 1) // area
+    if pixels.itemsize == 2 and sys.byteorder == 'little':
+        pixels.byteswap()  # PGM stores two-byte shades most significant byte first.
+
+    stream.write(f'P5\n{width} {height}\n{shades}\n'.encode('ascii'))
+    stream.write(pixels.tobytes())
+
@@ -0,0 +1,319 @@
+import asyncio
+import itertools
+import json
+import time
+
+import gameboard
+import moves
+import render
+import solver
+import tours
+
+# How long a session may go without a request before it is evicted, in seconds.
+DEFAULT_IDLE_TIMEOUT = 15 * 60
+
+# How long a solve request may search for, in seconds, before the session is told the search ran out of time.
+DEFAULT_SOLVE_TIMEOUT = 30.0
+
+# The largest board a session may be started on. Sessions are set up on the event loop, and the first one on a board of
+# this size takes a fraction of a second to work out the moves of every square, during which no other client is
+# served; it also keeps one client from taking all the server's memory.
+MAX_SQUARES = 250 * 250
+
+
+class RequestError(Exception):
+    """A request that can't be carried out. Its message is sent back to the client as the error of the response."""
+
+
+def integer_pair(value, message) -> list:
+    """Returns <value> if it is a list of two integers, as JSON gives them, and raises RequestError(message) if not.
+
+    Floats such as 1.5, strings and booleans aren't taken for integers, the same way as a 'session' isn't.
+    """
+    if not (isinstance(value, list) and len(value) == 2
+            and all(isinstance(number, int) and not isinstance(number, bool) for number in value)):
+        raise RequestError(message)
+    return value
+
+
+class Session:
+    """One game of KnightsTour, played through requests rather than input() and print.
+
+    The only state kept is a solver.TourState, which holds one small integer per square and the path of the knight;
+    the board the player sees is rendered from it when asked for.
+
+    Attributes:
+        id (int): The number the client refers to the session by.
+        tour (solver.TourState): The squares the knight has visited so far, in order.
+        last_active (float): The time.monotonic() of the last request for this session.
+    """
+
+    def __init__(self, session_id, width, height, start):
+        self.id = session_id
+        self.tour = solver.TourState(width, height)
+        self.tour.visit(self.tour.square(start))
+        self.last_active = time.monotonic()
+
+    @property
+    def position(self) -> list:
+        """The Cartesian position [x, y] of the knight."""
+        return self.tour.position(self.tour.path[-1])
+
+    def status(self) -> str:
+        """Returns 'won' once every square has been visited, 'stuck' if the knight has no move left, or 'playing'."""
+        if self.tour.is_complete():
+            return 'won'
+        if self.tour.degree(self.tour.path[-1]) == 0:
+            return 'stuck'
+        return 'playing'
+
+    def move(self, position) -> None:
+        """Moves the knight to the Cartesian <position> [x, y], if it is a legal move that hasn't been visited."""
+        tour = self.tour
+        x, y = position
+        if not (0 < x <= tour.width and 0 < y <= tour.height):
+            raise RequestError(f'{position} is not on the board')
+        square = tour.square(position)
+        if tour.order[square] or square not in tour.neighbors(tour.path[-1]):
+            raise RequestError(f'{position} is not a legal move from {self.position}')
+        tour.visit(square)
+
+    def board(self) -> str:
+        """Renders the board as KnightsTour prints it, with the Warnsdorff counts of the knight's next moves."""
+        tour = self.tour
+        cell_length = gameboard.cell_size([tour.width, tour.height])
+        flat = ['*'.rjust(cell_length) if step else '_' * cell_length for step in tour.order]
+        current = tour.path[-1]
+        flat[current] = 'X'.rjust(cell_length)
+        for square in tour.neighbors(current):
+            if not tour.order[square]:
+                flat[square] = str(tour.degree(square)).rjust(cell_length)
+
+        rows = [flat[row_start:row_start + tour.width] for row_start in range(0, tour.size, tour.width)]
+        return render.board_text(rows)
+
+    def describe(self) -> dict:
+        """Returns the state of the game as it is sent back to the client after every request."""
+        return {
+            'session': self.id,
+            'width': self.tour.width,
+            'height': self.tour.height,
+            'position': self.position,
+            'visited': len(self.tour.path),
+            'status': self.status(),
+        }
+
+
+def solve_start(width, height, start, timeout):
+    """Looks for a tour from <start> within <timeout> seconds, in an executor, and returns the result as JSON data."""
+    result = tours.winning_result(width, height, start, timeout=timeout)
+    positions = [moves.square_position(square, width) for square in result.path]
+    return {'status': result.status, 'tour': positions if result.solved else None,
+            'partial': positions if result.exhausted else None}
+
+
+class SessionServer:
+    """Hosts many games at once, each as a Session, for clients that send requests as JSON objects.
+
+    Requests are handled on an asyncio event loop, so any number of clients can play at the same time in one process,
+    while searches for tours, which can take a long time, are run in <executor> so they never hold up other clients.
+    Sessions that haven't had a request for <idle_timeout> seconds are evicted by a task started with start.
+
+    Every request is a JSON object with a 'command', and most also name their 'session':
+        {"command": "new", "dims": [8, 8], "start": [1, 1]} starts a game and returns its session;
+        {"command": "move", "session": 1, "to": [2, 3]} moves the knight;
+        {"command": "board", "session": 1} returns the board, as text;
+        {"command": "solve", "session": 1} looks for a tour from the game's first square, and returns the outcome
+        (see solve_start) under 'solve', apart from the 'status' of the game itself;
+        {"command": "close", "session": 1} ends the game.
+    Every response is a JSON object with 'ok' set to true, or to false with an 'error' saying what went wrong. A
+    request that fails in a way the server didn't foresee gets such an error too, rather than dropping the
+    connection.
+
+    Attributes:
+        sessions (dict): The live sessions, by id.
+    """
+
+    def __init__(self, executor=None, idle_timeout=DEFAULT_IDLE_TIMEOUT, solve_timeout=DEFAULT_SOLVE_TIMEOUT):
+        self.executor = executor
+        self.idle_timeout = idle_timeout
+        self.solve_timeout = solve_timeout
+        self.sessions = {}
+        self._ids = itertools.count(1)
+        self._evictor = None
+
+    def start(self) -> None:
+        """Starts evicting idle sessions. Has to be called from the event loop the server runs on."""
+        if self.executor is None:
+            from concurrent.futures import ProcessPoolExecutor  # Loads multiprocessing, so only when it is needed.
+            self.executor = ProcessPoolExecutor()
+        if self._evictor is None:
+            self._evictor = asyncio.get_running_loop().create_task(self._evict_idle())
+
+    async def stop(self) -> None:
+        """Stops evicting idle sessions and shuts down the executor."""
+        if self._evictor is not None:
+            self._evictor.cancel()
+            try:
+                await self._evictor
+            except asyncio.CancelledError:
+                pass
+            self._evictor = None
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _evict_idle(self) -> None:
+        """Evicts the sessions that have been idle for longer than idle_timeout, checking a few times per timeout."""
+        while True:
+            await asyncio.sleep(max(self.idle_timeout / 4, 0.01))
+            self.evict_idle()
+
+    def evict_idle(self, now=None) -> list:
+        """Evicts every session idle for longer than idle_timeout, and returns their ids."""
+        now = time.monotonic() if now is None else now
+        idle = [session_id for session_id, session in self.sessions.items()
+                if now - session.last_active > self.idle_timeout]
+        for session_id in idle:
+            del self.sessions[session_id]
+        return idle
+
+    async def handle(self, request) -> dict:
+        """Carries out one request and returns the response, turning any error into an error response.
+
+        A RequestError is the client's mistake, and its message is sent back as it is. Anything else, such as a search
+        that failed in the executor, is named by its type as well, so the client can tell the two apart.
+        """
+        try:
+            return {'ok': True, **await self._dispatch(request)}
+        except RequestError as error:
+            return {'ok': False, 'error': str(error)}
+        except Exception as error:
+            return {'ok': False, 'error': f'internal error: {type(error).__name__}: {error}'}
+
+    def _session(self, request) -> Session:
+        """Returns the session the request names, and marks it as active."""
+        session_id = request.get('session')
+        if not isinstance(session_id, int) or isinstance(session_id, bool):
+            raise RequestError("'session' has to be the number of a session")
+        session = self.sessions.get(session_id)
+        if session is None:
+            raise RequestError(f"no session {request.get('session')}")
+        session.last_active = time.monotonic()
+        return session
+
+    async def _dispatch(self, request) -> dict:
+        if not isinstance(request, dict):
+            raise RequestError('a request has to be a JSON object')
+        command = request.get('command')
+
+        if command == 'new':
+            message = "'new' needs 'dims' as [width, height] and 'start' as [x, y], all integers"
+            width, height = integer_pair(request.get('dims'), message)
+            start = integer_pair(request.get('start', [1, 1]), message)
+            if width < 1 or height < 1 or width * height > MAX_SQUARES:
+                raise RequestError(f'boards have to have between 1 and {MAX_SQUARES} squares')
+            if not (0 < start[0] <= width and 0 < start[1] <= height):
+                raise RequestError(f'start {start} is not on a {width}x{height} board')
+            session = Session(next(self._ids), width, height, start)
+            self.sessions[session.id] = session
+            return session.describe()
+
+        session = self._session(request)
+        if command == 'move':
+            session.move(integer_pair(request.get('to'), "'move' needs 'to' as [x, y], both integers"))
+            return session.describe()
+        if command == 'board':
+            return {**session.describe(), 'board': session.board()}
+        if command == 'solve':
+            tour = session.tour
+            start = tour.position(tour.path[0])
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(self.executor, solve_start, tour.width, tour.height, start,
+                                                self.solve_timeout)
+            return {**session.describe(), 'solve': result}
+        if command == 'close':
+            del self.sessions[session.id]
+            return {'session': session.id}
+
+        raise RequestError(f'unknown command {command!r}')
+
+    async def serve_connection(self, reader, writer) -> None:
+        """Serves one client connected over a stream, reading one JSON request per line and writing one response per
+        line, until the client disconnects.
+
+        The requests of one client are handled one after another, but every connection is served by a task of its own
+        and searches run in the executor, so a slow solve only holds up the client that asked for it.
+        """
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                except json.JSONDecodeError:
+                    response = {'ok': False, 'error': 'a request has to be a line of JSON'}
+                else:
+                    response = await self.handle(request)
+                writer.write(json.dumps(response).encode() + b'\n')
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host='127.0.0.1', port=0):
+        """Starts listening for clients on <host> and <port> (0 picks a free port), and returns the asyncio server."""
+        self.start()
+        return await asyncio.start_server(self.serve_connection, host, port)
+
+
+class InProcessClient:
+    """A client that sends its requests straight to a SessionServer in the same process, for tests and scripts.
+
+    It speaks the same JSON as a client connected over a socket: every request is encoded and decoded again, so
+    anything that wouldn't survive the trip over the wire fails here too.
+    """
+
+    def __init__(self, server):
+        self.server = server
+
+    async def request(self, command, **arguments) -> dict:
+        """Sends the request <command> with the given <arguments> and returns the response."""
+        request = json.loads(json.dumps({'command': command, **arguments}))
+        return json.loads(json.dumps(await self.server.handle(request)))
+
+
+class SocketClient:
+    """A client connected to a SessionServer over TCP, as returned by connect."""
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+
+    async def request(self, command, **arguments) -> dict:
+        """Sends the request <command> with the given <arguments> and returns the response."""
+        self.writer.write(json.dumps({'command': command, **arguments}).encode() + b'\n')
+        await self.writer.drain()
+        return json.loads(await self.reader.readline())
+
+    async def close(self) -> None:
+        self.writer.close()
+        await self.writer.wait_closed()
+
+
+async def connect(host, port) -> SocketClient:
+    """Connects to a SessionServer listening on <host> and <port>."""
+    reader, writer = await asyncio.open_connection(host, port)
+    return SocketClient(reader, writer)
+
+
+async def run(host='127.0.0.1', port=8765, idle_timeout=DEFAULT_IDLE_TIMEOUT, solve_timeout=DEFAULT_SOLVE_TIMEOUT):
+    """Runs a SessionServer on <host> and <port> until it is cancelled."""
+    server = SessionServer(idle_timeout=idle_timeout, solve_timeout=solve_timeout)
+    listener = await server.serve(host, port)
+    try:
+        async with listener:
+            await listener.serve_forever()
+    finally:
+        await server.stop()
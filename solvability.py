@@ -0,0 +1,133 @@
+import cache
+import moves
+
+# The answers a solvability map can give for a start square; UNKNOWN is only given when a search ran out of budget.
+SOLVABLE = 1
+UNSOLVABLE = 0
+UNKNOWN = 2
+
+# The finished maps worked out so far, by (width, height), as bytes in the order of square index.
+_maps = {}
+
+
+def has_closed_tour(width, height) -> bool:
+    """Checks Schwenk's conditions for a <width> by <height> board to have a closed tour.
+
+    By Schwenk's theorem (1991), a board whose shorter side is m and longer side is n has a closed tour unless m and n
+    are both odd, m is 1, 2 or 4, or m is 3 and n is 4, 6 or 8. A closed tour can be started from any of its squares,
+    so on such a board there is a tour from every start square.
+    """
+    m, n = sorted((width, height))
+    if m * n == 1:
+        return False
+    return not (m % 2 and n % 2 or m in (1, 2, 4) or m == 3 and n in (4, 6, 8))
+
+
+def known_answer(width, height, square):
+    """Returns what is already known, without a search, about whether there is a tour from <square>.
+
+    These answers come from theory rather than search:
+        - a single square is a tour of itself;
+        - on a board with a side of 1 or 2 squares (and more than one square), the knight can never visit every square;
+        - on a board with a closed tour (see has_closed_tour), there is a tour from every square;
+        - a knight always moves to a square of the other color, so on a board with an odd number of squares, every
+          tour starts and ends on the color that has one more square than the other, and there is none from the other
+          color;
+        - on an odd n by n board with n of at least 7, there is a tour from every square of that larger color, since
+          by Conrad, Hindrichs, Morsy and Wegener (1994) there is then a path through every square between any two of
+          its squares.
+
+    Return:
+        answer (int or None): SOLVABLE, UNSOLVABLE, or None if it takes a search to find out.
+    """
+    if width * height == 1:
+        return SOLVABLE
+    if min(width, height) <= 2:
+        return UNSOLVABLE
+    if has_closed_tour(width, height):
+        return SOLVABLE
+    if width * height % 2:
+        y, x = divmod(square, width)
+        # The corners, with x + y even, are on the larger color.
+        if (x + y) % 2:
+            return UNSOLVABLE
+        if width == height and width >= 7:
+            return SOLVABLE
+    return None
+
+
+def solvability_map(width, height, use_cache=True, max_nodes=None, workers=1) -> list:
+    """Works out, for every square of a <width> by <height> board, whether there is a tour that starts there.
+
+    Only one square of each set of squares that the symmetries of the board map onto each other (those that share a
+    cache.canonical_key) is looked at, and its answer is shared with the rest. Squares whose answer is known from
+    theory (see known_answer) aren't searched at all, and the rest are solved by solver.solve_within, with every tour
+    found, or proven not to exist, stored in cache.default_cache like those found by tours.winning_board. Finished maps
+    are cached as well, both on disk and in memory, so asking for the same board again costs next to nothing.
+
+    Args:
+        width (int): The width of the board.
+        height (int): The height of the board.
+        use_cache (bool): Whether to look up and store the map, and the tours searched for, in the on-disk cache.
+        max_nodes (int): The most moves to try from each searched square, or None to search each one to the end.
+                Squares whose search runs out get UNKNOWN, and a map with any of these isn't cached.
+        workers (int): The number of processes to search in. With 1, the squares are searched one after another in
+                this process; otherwise they are shared out by parallel.solve_starts, with None for one per CPU.
+
+    Return:
+        map (list): One row per y, from y = 1 up, each holding SOLVABLE, UNSOLVABLE or UNKNOWN for every square of the
+        row.
+    """
+    tour_cache = cache.default_cache() if use_cache else None
+    answers = _maps.get((width, height)) if use_cache else None
+    if answers is None and tour_cache:
+        answers = tour_cache.get_map(width, height)
+    if answers is None:
+        answers = _work_out_map(width, height, tour_cache, max_nodes, workers)
+        if UNKNOWN not in answers and tour_cache:
+            tour_cache.put_map(width, height, answers)
+    if UNKNOWN not in answers:
+        _maps[width, height] = answers
+
+    return [list(answers[row_start:row_start + width]) for row_start in range(0, width * height, width)]
+
+
+def _work_out_map(width, height, tour_cache, max_nodes, workers) -> bytes:
+    """Works out the answers of solvability_map as a flat bytes object, by square index, without the map caches."""
+    symmetric_squares = {}
+    for square in range(width * height):
+        key = cache.canonical_key(width, height, moves.square_position(square, width))[:3]
+        symmetric_squares.setdefault(key, []).append(square)
+
+    answers = bytearray([UNKNOWN]) * (width * height)
+    unanswered = []
+    for squares in symmetric_squares.values():
+        answer = known_answer(width, height, squares[0])
+        if answer is None and tour_cache:
+            path = tour_cache.get(width, height, moves.square_position(squares[0], width))
+            answer = None if path is None else SOLVABLE if path else UNSOLVABLE
+        if answer is None:
+            unanswered.append(squares)
+        for square in squares:
+            answers[square] = UNKNOWN if answer is None else answer
+
+    starts = [moves.square_position(squares[0], width) for squares in unanswered]
+    for squares, start, result in zip(unanswered, starts, _search(width, height, starts, max_nodes, workers)):
+        if result.exhausted:
+            continue
+        if tour_cache:
+            tour_cache.put(width, height, start, result.path)
+        for square in squares:
+            answers[square] = SOLVABLE if result.solved else UNSOLVABLE
+
+    return bytes(answers)
+
+
+def _search(width, height, starts, max_nodes, workers) -> list:
+    """Searches for a tour from each of <starts> within <max_nodes>, and returns their solver.SolveResults in order."""
+    if workers == 1:
+        import solver  # Only needed for squares whose answer isn't known or cached.
+        return [solver.solve_within(width, height, start, max_nodes=max_nodes) for start in starts]
+
+    import parallel  # Starting worker processes needs multiprocessing, which is slow to import.
+    return parallel.solve_starts(width, height, starts, max_nodes, workers)
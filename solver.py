@@ -0,0 +1,760 @@
+import sys
+import time
+from array import array
+from functools import cached_property
+
+import boardarray
+import moves
+import stitched
+
+
+class TourState:
+    """The state of a partially built tour, updated in place as the algorithm moves and backtracks.
+
+    Squares are referred to by their index in a flat, row-major array, where the square at Cartesian coordinates
+    [x, y] has index (y - 1) * width + (x - 1). The state holds the step at which each square was visited (0 for
+    squares that haven't been visited) and the path of visited squares, so a move and its undo each cost O(1) and the
+    memory used doesn't grow with the depth of the search. The string board used by the rest of the project is only
+    built once the search is over, by to_board.
+
+    The Warnsdorff count of every square, the number of unvisited squares a knight move away from it, is kept in
+    <degrees>. Visiting a square lowers the count of each of its neighbors by one, and undoing the visit raises them
+    again, so the count of any square can be looked up rather than recounted. The counts and the neighbor table they
+    are based on are only built the first time they are needed, so a state that is only filled in with a finished
+    tour by follow, and then rendered, never pays for them.
+    """
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.size = width * height
+
+        self.order = array('I', [0]) * self.size
+        self.path = []
+
+    @cached_property
+    def neighbor_table(self) -> tuple:
+        """The moves.neighbor_table of the board."""
+        return moves.neighbor_table(self.width, self.height)
+
+    @cached_property
+    def degrees(self) -> array:
+        """The number of unvisited squares a knight move away from each square, counted by boardarray.degree_array."""
+        return boardarray.degree_array(self.width, self.height, self.order)
+
+    def square(self, position) -> int:
+        """Returns the index of the square at the given Cartesian position [x, y]."""
+        return moves.square_index(position, self.width)
+
+    def position(self, square) -> list:
+        """Returns the Cartesian position [x, y] of the square with the given index."""
+        return moves.square_position(square, self.width)
+
+    def neighbors(self, square) -> tuple:
+        """Returns the indices of the squares a knight on the given square could move to, visited or not."""
+        return self.neighbor_table[square]
+
+    def degree(self, square) -> int:
+        """Returns the number of unvisited squares a knight on the given square could move to."""
+        return self.degrees[square]
+
+    def visit(self, square) -> None:
+        """Moves the knight to the given square, which becomes the next step of the tour."""
+        degrees = self.degrees
+        self.path.append(square)
+        self.order[square] = len(self.path)
+        for neighbor in self.neighbor_table[square]:
+            degrees[neighbor] -= 1
+
+    def follow(self, squares) -> None:
+        """Visits each of the given squares in turn, in bulk, as if visit had been called for each one."""
+        order = self.order
+        step = len(self.path)
+        for square in squares:
+            step += 1
+            order[square] = step
+        self.path.extend(squares)
+
+        if 'degrees' in self.__dict__:
+            degrees = self.degrees
+            neighbor_table = self.neighbor_table
+            for square in squares:
+                for neighbor in neighbor_table[square]:
+                    degrees[neighbor] -= 1
+
+    def undo(self) -> int:
+        """Takes back the last step of the tour, and returns the square it visited."""
+        degrees = self.degrees
+        square = self.path.pop()
+        self.order[square] = 0
+        for neighbor in self.neighbor_table[square]:
+            degrees[neighbor] += 1
+        return square
+
+    def is_complete(self) -> bool:
+        """Checks whether every square on the board has been visited."""
+        return len(self.path) == self.size
+
+    def to_board(self) -> list:
+        """Renders the state as a board of the kind made by gameboard.game_board.
+
+        Visited squares hold the step at which they were visited, right-aligned to the cell size of the board, and
+        unvisited squares hold underscores.
+        """
+        cell_length = len(str(self.height) + str(self.width))
+        empty = '_' * cell_length
+        board = []
+        for row_start in range(0, self.size, self.width):
+            row = self.order[row_start:row_start + self.width]
+            board.append([str(step).rjust(cell_length) if step else empty for step in row])
+
+        return board
+
+
+def warnsdorff_order(state, squares) -> list:
+    """Sorts the given unvisited squares so that the most promising move for the algorithm comes first.
+
+    Squares are ranked by their Warnsdorff count, fewest onward moves first, with ties broken by Roth's rule: the
+    square farthest from the center of the board comes first. Pohl's rule (smallest summed Warnsdorff count of the
+    onward moves) costs more and, from the same start, runs into dead ends far more often on boards of a few hundred
+    squares a side, which leaves the search backtracking through an enormous subtree. Any remaining ties keep the
+    order of the given squares, so the result is deterministic.
+
+    Args:
+        state (TourState): The current state of the tour.
+        squares (list): Indices of the unvisited squares the knight could move to next.
+
+    Return:
+        squares (list): The same squares, sorted from most to least promising.
+    """
+    width = state.width
+    degrees = state.degrees
+    # Doubled coordinates of the center, so that the distances stay integers.
+    center_x = width - 1
+    center_y = state.height - 1
+
+    ranked = []
+    for i, square in enumerate(squares):
+        dx = 2 * (square % width) - center_x
+        dy = 2 * (square // width) - center_y
+        ranked.append((degrees[square], -(dx * dx + dy * dy), i, square))
+
+    ranked.sort()
+    return [square for _, _, _, square in ranked]
+
+
+# The most squares _forced_end searches from each square, when checking whether the unvisited squares have been split.
+CONNECTIVITY_LIMIT = 24
+
+
+class TourSearch:
+    """A depth-first search for a tour, run on an explicit stack so that its depth isn't limited by Python's recursion
+    limit.
+
+    The stack holds, for each step of the tour after the starting path, the squares that are still to be tried from
+    there, most promising last. Everything the search needs is kept on the object, so run can stop after a given
+    number of moves and be called again later to carry on from exactly where it stopped. Once a tour has been found,
+    tours carries on past it to the next one, so every tour can be listed without being held in memory at once.
+
+    Attributes:
+        state (TourState): The tour being searched, changed in place. Its path at the start of the search is never
+                taken back.
+        warnsdorff (bool): Whether to try moves in Warnsdorff order rather than in the order of moves.KNIGHT_MOVES.
+        closed (bool): Whether only closed tours count, those whose last square is a knight move from the first.
+        observer (progress.SearchObserver or None): Told when the search starts, every <observer.interval> moves
+                while it runs, and when it finishes.
+        prune (bool): Whether to cut off branches that _forced_end shows can't lead to a tour.
+        nodes (int): The number of moves tried so far.
+        backtracks (int): The number of moves taken back so far.
+        max_depth (int): The length of the longest path the search has reached so far. best_path returns that path.
+        solved (bool or None): True once a tour has been found, False once every sequence of moves has been tried
+                without finding one, and None while the search isn't finished.
+    """
+
+    def __init__(self, state, warnsdorff=True, closed=False, observer=None, prune=True):
+        self.state = state
+        self.warnsdorff = warnsdorff
+        self.closed = closed
+        self.observer = observer
+        self.prune = prune
+        self.solved = None
+        self.nodes = 0
+        self.backtracks = 0
+        self.max_depth = len(state.path)
+
+        self._stack = []
+        self._ends = []
+        self._started = False
+        self._reported = 0
+        self._best = list(state.path)
+
+    def _candidates(self, square) -> list:
+        """Returns the unvisited squares a knight move away from <square>, ordered so the best one is last."""
+        state = self.state
+        candidates = [neighbor for neighbor in state.neighbor_table[square] if not state.order[neighbor]]
+        if self.warnsdorff:
+            candidates = warnsdorff_order(state, candidates)
+        candidates.reverse()
+        return candidates
+
+    def _root_end(self):
+        """Looks over the whole board for the squares the tour is forced to end on, as _forced_end does after a move.
+
+        The colors of the squares are counted as well. A knight always moves to a square of the other color, so the
+        rest of the tour can only cover the unvisited squares if as many of them have the other color to the knight's
+        square as have its own color, or one more. Each move keeps this true, so it only needs checking here.
+
+        Return:
+            end (int or None): The one square the tour has to end on, -1 if there is none, or None if there can't be a
+            tour at all.
+        """
+        state = self.state
+        order = state.order
+        degrees = state.degrees
+        width = state.width
+        current = state.path[-1]
+        reachable = state.neighbor_table[current]
+        color = sum(divmod(current, width)) % 2
+
+        other_color = 0
+        for square in range(state.size):
+            if not order[square] and sum(divmod(square, width)) % 2 != color:
+                other_color += 1
+        if other_color - (state.size - len(state.path) - other_color) not in (0, 1):
+            return None
+
+        end = -1
+        for square in range(state.size):
+            if order[square] or square in reachable:
+                continue
+            if degrees[square] == 0:
+                return None
+            if degrees[square] == 1:
+                if end != -1:
+                    return None
+                end = square
+        return end
+
+    def _forced_end(self, square, previous, end, connectivity=True):
+        """Checks whether the knight, having just moved from <previous> to <square>, can still finish the tour.
+
+        An unvisited square that the knight can't move to next, and that has no unvisited neighbors, can never be
+        reached, and one with a single unvisited neighbor can be reached but never left, so it has to be the last
+        square of the tour; two such squares mean there is no tour. Nor is there one if any square that the knight can
+        move to next has no unvisited neighbors, unless it is the last square left. Degrees only fall for the squares
+        around <square>, which the knight can move to next, so apart from <end> (the forced end before this move)
+        only the squares around <previous> can have become such squares, and each move costs just these checks.
+
+        Lastly, moving away from <previous> can split the unvisited squares in two, so that they can't all be reached.
+        Only the unvisited neighbors of <previous> can be cut off from <square> by this move, so each of them is
+        searched from, breadth first, until the search meets <square> or one of its unvisited neighbors; if it runs
+        out of squares first, they were split. Every square a search passes through is then known to be connected, so
+        later searches can stop as soon as they meet it. The searches give up after CONNECTIVITY_LIMIT squares, so
+        only splits that leave a small pocket of squares behind, which are by far the most common, are found. They
+        cost more than the rest of the checks together and prune far less, so they are only made if <connectivity>
+        is set, which _run does once the search has had to backtrack: a search that never meets a dead end, as in
+        most Warnsdorff searches of large boards, gains nothing from them.
+
+        Return:
+            end (int or None): The one square the tour now has to end on, -1 if there is none, or None if the tour can't
+            be finished.
+        """
+        state = self.state
+        order = state.order
+        degrees = state.degrees
+        table = state.neighbor_table
+        reachable = table[square]
+
+        if len(state.path) < state.size - 1:
+            for neighbor in reachable:
+                if not order[neighbor] and not degrees[neighbor]:
+                    return None
+
+        new_end = end if end != -1 and not order[end] and end not in reachable else -1
+        targets = []
+        # The neighbors of <previous> are the same color as <square>, so none of them is a knight move from it.
+        for neighbor in table[previous]:
+            if order[neighbor]:
+                continue
+            degree = degrees[neighbor]
+            if degree == 0:
+                return None
+            if degree == 1 and neighbor != new_end:
+                if new_end != -1:
+                    return None
+                new_end = neighbor
+            targets.append(neighbor)
+
+        if connectivity and targets:
+            connected = {neighbor for neighbor in reachable if not order[neighbor]}
+            connected.add(square)
+            for target in targets:
+                if target in connected:
+                    continue
+                seen = [target]
+                index = 0
+                while index < len(seen) and index < CONNECTIVITY_LIMIT:
+                    for neighbor in table[seen[index]]:
+                        if neighbor in connected:
+                            connected.update(seen)
+                            break
+                        if not order[neighbor] and neighbor not in seen:
+                            seen.append(neighbor)
+                    else:
+                        index += 1
+                        continue
+                    break
+                else:
+                    if index == len(seen):
+                        return None
+
+        return new_end
+
+    @property
+    def depth(self) -> int:
+        """The length of the path the search is on now."""
+        return len(self.state.path)
+
+    def best_path(self) -> list:
+        """Returns a copy of the longest path the search has reached so far, the tour itself once one is found.
+
+        The path is only copied when the search is about to take back a path longer than any before it, so keeping it
+        costs a copy per new record rather than one per move.
+        """
+        path = self.state.path
+        return list(path) if len(path) >= len(self._best) else list(self._best)
+
+    def run(self, max_moves=None):
+        """Carries on with the search until it finishes, or until <max_moves> more moves have been tried.
+
+        Without an observer the whole run happens in one go, so the only cost of being able to watch a search is this
+        check. With one, the run is split into stretches that end every <observer.interval> moves of the whole search,
+        and the observer is told about the progress at the end of each of them. A run cut short by <max_moves> before
+        the end of a stretch tells the observer nothing, so a search run a little at a time, as solve_within does, is
+        reported on as often as one run in one go.
+
+        Return:
+            solved (bool or None): True if a tour was found, False if there is none, or None if the search stopped
+            after <max_moves> moves without finishing.
+        """
+        observer = self.observer
+        if observer is None or self.solved is not None:
+            return self._run(max_moves)
+
+        if not self._started:
+            observer.started(self)
+        solved = None
+        remaining = max_moves
+        while solved is None and (remaining is None or remaining > 0):
+            stretch = observer.interval - (self.nodes - self._reported)
+            if remaining is not None:
+                stretch = min(stretch, remaining)
+            nodes = self.nodes
+            solved = self._run(stretch)
+            if remaining is not None:
+                remaining -= self.nodes - nodes
+            if solved is None and self.nodes - self._reported >= observer.interval:
+                self._reported = self.nodes
+                observer.progress(self)
+
+        if solved is not None:
+            observer.finished(self)
+        return solved
+
+    def _run(self, max_moves):
+        """Runs the search itself, as described in run, without telling the observer anything."""
+        if self.solved is not None:
+            return self.solved
+
+        state = self.state
+        stack = self._stack
+        ends = self._ends
+        prune = self.prune
+        first = state.path[0]
+        if not self._started:
+            self._started = True
+            if state.is_complete():
+                self.solved = not self.closed or first in state.neighbor_table[state.path[-1]]
+                return self.solved
+            end = self._root_end() if prune else -1
+            if end is None:
+                self.solved = False
+                return False
+            stack.append(self._candidates(state.path[-1]))
+            ends.append(end)
+
+        path = state.path
+        moves_tried = 0
+        backtracks = 0
+        max_depth = self.max_depth
+        best_length = len(self._best)
+        try:
+            while stack:
+                candidates = stack[-1]
+                if not candidates:
+                    stack.pop()
+                    ends.pop()
+                    if stack:
+                        if len(path) > best_length:
+                            self._best = list(path)
+                            best_length = len(path)
+                        state.undo()
+                        backtracks += 1
+                    continue
+
+                if max_moves is not None and moves_tried >= max_moves:
+                    return None
+                moves_tried += 1
+
+                square = candidates.pop()
+                state.visit(square)
+                if state.is_complete():
+                    if not self.closed or first in state.neighbor_table[square]:
+                        self.solved = True
+                        return True
+                    if len(path) > best_length:
+                        self._best = list(path)
+                        best_length = len(path)
+                    state.undo()
+                    backtracks += 1
+                    continue
+                # Once every square a knight move from the first has been visited, the tour can't be closed.
+                end = self._forced_end(square, path[-2], ends[-1], backtracks or self.backtracks) if prune else -1
+                if end is None or self.closed and not state.degrees[first]:
+                    if len(path) > best_length:
+                        self._best = list(path)
+                        best_length = len(path)
+                    state.undo()
+                    backtracks += 1
+                    continue
+                if len(path) > max_depth:
+                    max_depth = len(path)
+                stack.append(self._candidates(square))
+                ends.append(end)
+        finally:
+            self.nodes += moves_tried
+            self.backtracks += backtracks
+            self.max_depth = max(max_depth, len(path))
+
+        self.solved = False
+        return False
+
+    def tours(self):
+        """Yields each tour the search finds, in turn, as a new list of the indices of its squares.
+
+        Between tours the search carries on from where it left off, so the tours are only found as they are asked for.
+        """
+        while self.run():
+            yield list(self.state.path)
+            self.solved = None
+            if self._stack:
+                self.state.undo()
+            else:
+                self.solved = False
+
+
+def extend_tour(state, warnsdorff=True, observer=None) -> bool:
+    """Extends the tour in <state> until it covers the whole board, backtracking as needed.
+
+    The search is done in place by a TourSearch: on success <state> holds the finished tour, and on failure it is
+    returned to the way it was given.
+
+    Args:
+        state (TourState): A state whose path holds at least the starting square.
+        warnsdorff (bool): Whether to try moves in Warnsdorff order rather than in the order of moves.KNIGHT_MOVES.
+        observer (progress.SearchObserver): Watches the progress of the search, if given.
+
+    Return:
+        boolean: True if the tour was completed, and False if no sequence of moves completes it.
+    """
+    return TourSearch(state, warnsdorff, observer=observer).run()
+
+
+def solve(width, height, start, warnsdorff=True, stitch=True, observer=None):
+    """Finds a tour of a <width> by <height> board starting from the Cartesian position <start>.
+
+    Boards that stitched.should_stitch are toured by stitching structured block tours together, which takes time in
+    proportion to the number of squares and can't run into a dead end. Any other board is searched by extend_tour, to
+    the end, which for a board with no closed tour (see tours.default_timeout) may never come; solve_within
+    searches within a budget instead.
+
+    Args:
+        width (int): The width of the board.
+        height (int): The height of the board.
+        start (list): The Cartesian position [x, y] of the first square of the tour.
+        warnsdorff (bool): Whether to search in Warnsdorff order rather than in the order of moves.KNIGHT_MOVES.
+        stitch (bool): Whether large boards may be toured by stitching rather than by searching.
+        observer (progress.SearchObserver): Watches the progress of the search, if there is one.
+
+    Return:
+        state (TourState): The finished tour, or None if there is no tour from <start>.
+    """
+    state = TourState(width, height)
+    if stitch and stitched.should_stitch(width, height):
+        state.follow(stitched.stitched_tour(width, height, start))
+        return state
+
+    state.visit(state.square(start))
+    if extend_tour(state, warnsdorff, observer):
+        return state
+
+    return None
+
+
+# The outcomes of solve_within.
+SOLVED = 'solved'
+UNSOLVABLE = 'unsolvable'
+EXHAUSTED = 'exhausted'
+
+# How many moves solve_within searches between checks of its deadline and of whether it has been cancelled.
+BUDGET_CHECK_INTERVAL = 2_000
+
+
+class SolveResult:
+    """The outcome of a search with a budget, as returned by solve_within.
+
+    Attributes:
+        status (str): SOLVED if a tour was found, UNSOLVABLE if there is proven to be none, or EXHAUSTED if the search
+                ran out of time or nodes, or was cancelled, before it could tell.
+        path (list): The indices of the squares of the tour if it was SOLVED, the longest path the search reached if it
+                was EXHAUSTED, and an empty list if it is UNSOLVABLE.
+        nodes (int): The number of moves the search tried.
+        elapsed (float): The number of seconds the search took.
+    """
+
+    def __init__(self, status, path, nodes=0, elapsed=0.0):
+        self.status = status
+        self.path = path
+        self.nodes = nodes
+        self.elapsed = elapsed
+
+    def __repr__(self):
+        return f'SolveResult({self.status!r}, {len(self.path)} squares, nodes={self.nodes}, elapsed={self.elapsed:.3f})'
+
+    @property
+    def solved(self) -> bool:
+        return self.status == SOLVED
+
+    @property
+    def exhausted(self) -> bool:
+        return self.status == EXHAUSTED
+
+
+def solve_within(width, height, start, timeout=None, max_nodes=None, cancel=None, closed=False, warnsdorff=True,
+                 stitch=True, observer=None) -> SolveResult:
+    """Searches for a tour as solve (or closed_tour) does, but gives up once a budget runs out.
+
+    The search runs BUDGET_CHECK_INTERVAL moves at a time, and between these it checks the clock and <cancel>, so it
+    stops within a few hundredths of a second of the deadline or of being cancelled, and never tries more than
+    <max_nodes> moves. Boards that can be stitched together are always solved, since that takes no search.
+
+    Args:
+        width (int): The width of the board.
+        height (int): The height of the board.
+        start (list): The Cartesian position [x, y] of the first square of the tour.
+        timeout (float): The most seconds to search for, or None for no limit.
+        max_nodes (int): The most moves to try, or None for no limit.
+        cancel: Anything with an is_set() method, such as a threading.Event, that is set to stop the search early.
+        closed (bool): Whether only a closed tour will do. A board with none (see has_closed_tour) is UNSOLVABLE
+                without a search.
+        warnsdorff (bool): Whether to search in Warnsdorff order rather than in the order of moves.KNIGHT_MOVES.
+        stitch (bool): Whether large boards may be toured by stitching rather than by searching.
+        observer (progress.SearchObserver): Watches the progress of the search, if there is one.
+
+    Return:
+        result (SolveResult): Whether a tour was found, proven not to exist, or the budget ran out first, with the tour
+        or the longest partial tour found.
+    """
+    started = time.monotonic()
+    if stitch and stitched.should_stitch(width, height):
+        return SolveResult(SOLVED, stitched.stitched_tour(width, height, start), 0, time.monotonic() - started)
+
+    state = TourState(width, height)
+    state.visit(state.square(start))
+    return complete_within(state, timeout, max_nodes, cancel, closed, warnsdorff, observer, started)
+
+
+def complete_within(state, timeout=None, max_nodes=None, cancel=None, closed=False, warnsdorff=True, observer=None,
+                    started=None) -> SolveResult:
+    """Extends the tour in <state> as extend_tour does, but gives up once a budget runs out, as solve_within does.
+
+    This is how a game in progress is finished from the squares already visited, rather than from an empty board. On
+    success <state> holds the finished tour, and otherwise it is returned to the way it was given.
+
+    Args:
+        state (TourState): A state whose path holds at least the starting square.
+        timeout (float): The most seconds to search for, or None for no limit.
+        max_nodes (int): The most moves to try, or None for no limit.
+        cancel: Anything with an is_set() method, such as a threading.Event, that is set to stop the search early.
+        closed (bool): Whether only a closed tour will do. A board with none (see has_closed_tour) is UNSOLVABLE
+                without a search.
+        warnsdorff (bool): Whether to search in Warnsdorff order rather than in the order of moves.KNIGHT_MOVES.
+        observer (progress.SearchObserver): Watches the progress of the search, if there is one.
+        started (float): The time.monotonic() the budget is counted from, if not from now.
+
+    Return:
+        result (SolveResult): As for solve_within, with the squares already in <state> at the start of every path.
+    """
+    started = time.monotonic() if started is None else started
+    if closed and not has_closed_tour(state.width, state.height):
+        return SolveResult(UNSOLVABLE, [], 0, time.monotonic() - started)
+    deadline = started + timeout if timeout is not None else None
+    given = len(state.path)
+    search = TourSearch(state, warnsdorff, closed, observer)
+
+    solved = None
+    while solved is None:
+        if cancel is not None and cancel.is_set():
+            break
+        if deadline is not None and time.monotonic() >= deadline:
+            break
+        stretch = BUDGET_CHECK_INTERVAL
+        if max_nodes is not None:
+            stretch = min(stretch, max_nodes - search.nodes)
+            if stretch <= 0:
+                break
+        solved = search.run(stretch)
+
+    elapsed = time.monotonic() - started
+    if solved:
+        return SolveResult(SOLVED, list(state.path), search.nodes, elapsed)
+
+    best_path = search.best_path()
+    while len(state.path) > given:
+        state.undo()
+    if solved is None:
+        if observer is not None:
+            observer.finished(search)
+        return SolveResult(EXHAUSTED, best_path, search.nodes, elapsed)
+    return SolveResult(UNSOLVABLE, [], search.nodes, elapsed)
+
+
+def iter_tours(width, height, start, closed=False, warnsdorff=True):
+    """Yields every tour of a <width> by <height> board starting from the Cartesian position <start>, one at a time.
+
+    Args:
+        width (int): The width of the board.
+        height (int): The height of the board.
+        start (list): The Cartesian position [x, y] of the first square of every tour.
+        closed (bool): Whether to only yield closed tours, whose last square is a knight move from the first.
+        warnsdorff (bool): Whether to search in Warnsdorff order, so the first tours come sooner.
+
+    Return:
+        tours (generator): Lists of the indices of the squares of each tour, in order.
+    """
+    if closed and not has_closed_tour(width, height):
+        return
+    state = TourState(width, height)
+    state.visit(state.square(start))
+    yield from TourSearch(state, warnsdorff, closed).tours()
+
+
+def has_closed_tour(width, height) -> bool:
+    """Checks whether a <width> by <height> board has any closed tour, by Schwenk's conditions (see
+    solvability.has_closed_tour), so that a search for one isn't run on a board that can't have one."""
+    import solvability  # Loads the cache as well, so only once a closed tour is asked for.
+    return solvability.has_closed_tour(width, height)
+
+
+def closed_tour(width, height, start, warnsdorff=True, stitch=True):
+    """Finds a closed tour of a <width> by <height> board, whose last square is a knight move from <start>.
+
+    Large boards are stitched together as in solve, since stitched tours are always closed, and boards that have no
+    closed tour by Schwenk's conditions (see has_closed_tour) aren't searched at all.
+
+    Return:
+        state (TourState): The finished tour, or None if there is no closed tour of the board.
+    """
+    if stitch and stitched.should_stitch(width, height):
+        return solve(width, height, start, warnsdorff, stitch)
+    if not has_closed_tour(width, height):
+        return None
+
+    state = TourState(width, height)
+    state.visit(state.square(start))
+    if TourSearch(state, warnsdorff, closed=True).run():
+        return state
+
+    return None
+
+
+def count_tours(width, height, start=None, closed=False) -> int:
+    """Counts the tours of a <width> by <height> board without building any of them.
+
+    The count is worked out square by square, on sets of visited squares held as bitmasks: the number of ways to
+    finish a tour depends only on which squares have been visited and which one the knight is on, so it is
+    remembered for each such pair and reused whenever another path arrives at the same one. Open tours can share
+    these counts between starting squares as well. Branches are cut off as soon as an unvisited square, other than
+    one the knight can move to next, has no unvisited neighbors, or more than one such square has only one, since
+    every such square could only be the last of the tour. This counts every tour of a 5x5 board in well under a
+    second and of a 6x6 board in minutes, though the remembered counts take a lot of memory beyond that.
+
+    Args:
+        width (int): The width of the board.
+        height (int): The height of the board.
+        start (list): The Cartesian position [x, y] every counted tour starts from, or None to count the tours from
+                every square.
+        closed (bool): Whether to only count closed tours, whose last square is a knight move from the first.
+
+    Return:
+        count (int): The number of tours, counting each direction of a tour and each of its starting squares
+        separately.
+    """
+    if closed and not has_closed_tour(width, height):
+        return 0
+    table = moves.neighbor_table(width, height)
+    neighbor_masks = [sum(1 << neighbor for neighbor in neighbors) for neighbors in table]
+    size = width * height
+    full = (1 << size) - 1
+
+    def count_from(first, counts):
+        stack_limit = sys.getrecursionlimit()
+        sys.setrecursionlimit(max(stack_limit, size + 100))
+        try:
+            return count(1 << first, first, first, counts)
+        finally:
+            sys.setrecursionlimit(stack_limit)
+
+    def count(visited, square, first, counts):
+        if visited == full:
+            return 1 if not closed or neighbor_masks[square] >> first & 1 else 0
+
+        key = (visited, square)
+        total = counts.get(key)
+        if total is not None:
+            return total
+
+        total = 0
+        unvisited = full & ~visited
+        reachable = neighbor_masks[square]
+        if closed and not neighbor_masks[first] & unvisited:
+            counts[key] = 0
+            return 0
+
+        ends = 0
+        remaining = unvisited & ~reachable
+        while remaining:
+            bit = remaining & -remaining
+            onward = neighbor_masks[bit.bit_length() - 1] & unvisited
+            if not onward:
+                counts[key] = 0
+                return 0
+            if not onward & (onward - 1):
+                ends += 1
+                if ends > 1:
+                    counts[key] = 0
+                    return 0
+            remaining ^= bit
+
+        following = reachable & unvisited
+        while following:
+            bit = following & -following
+            total += count(visited | bit, bit.bit_length() - 1, first, counts)
+            following ^= bit
+
+        counts[key] = total
+        return total
+
+    starts = [moves.square_index(start, width)] if start else range(size)
+    shared_counts = {}
+    return sum(count_from(first, {} if closed else shared_counts) for first in starts)
@@ -0,0 +1,494 @@
+from array import array
+from functools import lru_cache
+
+import moves
+
+# Boards with at least this many squares are toured by stitching blocks together rather than by searching. Strips
+# fewer than MIN_BLOCK squares high or wide are stitched whatever their size, since a search of them can run for ever.
+STITCHED_TOUR_SQUARES = 40_000
+
+# The smallest and largest sides of the blocks a board is divided into. Every side of at least MIN_BLOCK squares can
+# be split into blocks within this range, with at most one block of odd length.
+MIN_BLOCK = 8
+MAX_BLOCK = 15
+
+# The shortest and longest blocks a strip is divided into along its length, by the height of the strip, for strips
+# fewer than MIN_BLOCK squares high. A strip 3 squares high is built another way (see strip_tour), and one 4 squares
+# high has no closed tour at all.
+STRIP_BLOCKS = {5: (6, 10), 6: (5, 9), 7: (6, 10)}
+
+# The length of the blocks a strip 3 squares high starts from, one for each remainder of its length divided by 4,
+# which SPLICED_PATH then lengthens 4 squares at a time.
+SPLICED_STRIP_BASES = {0: 12, 2: 10}
+
+
+def can_stitch(width, height) -> bool:
+    """Checks whether a tour of a <width> by <height> board can be stitched together from structured block tours.
+
+    Stitching builds a closed tour, which doesn't exist for a board with an odd number of squares. A board at least
+    MIN_BLOCK squares on each side is divided into blocks both ways, and a strip 3, 5, 6 or 7 squares high or wide is
+    divided along its length, into blocks at least as long as STRIP_BLOCKS gives, or 10 squares long for a strip 3
+    squares high.
+    """
+    short, long = sorted([width, height])
+    if (width * height) % 2:
+        return False
+    if short >= MIN_BLOCK:
+        return True
+    if short == 3:
+        return long >= min(SPLICED_STRIP_BASES.values())
+    return short in STRIP_BLOCKS and long >= STRIP_BLOCKS[short][0]
+
+
+def should_stitch(width, height) -> bool:
+    """Checks whether a <width> by <height> board is toured by stitching rather than by searching: whether it
+    can_stitch, and either has at least STITCHED_TOUR_SQUARES squares or is a strip fewer than MIN_BLOCK squares high or
+    wide."""
+    return ((width * height >= STITCHED_TOUR_SQUARES or min(width, height) < MIN_BLOCK)
+            and can_stitch(width, height))
+
+
+def block_sizes(length, smallest=MIN_BLOCK, largest=MAX_BLOCK) -> list:
+    """Splits a side of the board into the sides of the blocks that will cover it.
+
+    Blocks are <smallest> squares long, apart from the last one, which takes up the rest of the side and is between
+    <smallest> and <largest> squares long. With the default sizes, only the last block can have an odd length, so a
+    board with an even number of squares never needs a block with an odd number of squares, which couldn't have a
+    closed tour.
+
+    Args:
+        length (int): The length of the side, at least <smallest>.
+        smallest (int): The length of every block but the last.
+        largest (int): The longest the last block may be.
+
+    Return:
+        sizes (list): The lengths of the blocks, in order, which add up to <length>.
+    """
+    sizes = []
+    while length > largest:
+        sizes.append(smallest)
+        length -= smallest
+    sizes.append(length)
+    return sizes
+
+
+def decode_moves(codes, x=0, y=0) -> list:
+    """Decodes a tour written as the indices in moves.KNIGHT_MOVES of its moves, as STRUCTURED_TOURS are.
+
+    Return:
+        positions (list): The zero-based (x, y) positions the tour visits, starting with (<x>, <y>) and followed by
+        one for every move in <codes>.
+    """
+    positions = [(x, y)]
+    for code in codes:
+        dx, dy = moves.KNIGHT_MOVES[int(code)]
+        x += dx
+        y += dy
+        positions.append((x, y))
+    return positions
+
+
+@lru_cache(maxsize=None)
+def block_tour(width, height) -> tuple:
+    """Returns the structured closed tour of a <width> by <height> block, as a tuple of zero-based (x, y) positions.
+
+    The tour starts on the bottom-left corner of the block, and is decoded from STRUCTURED_TOURS, or STRIP_TOURS for
+    the blocks of a strip, where each character is the index in moves.KNIGHT_MOVES of the next move, the last one
+    returning to the corner.
+    """
+    codes = STRUCTURED_TOURS.get((width, height)) or STRIP_TOURS[(width, height)]
+    return tuple(decode_moves(codes[:-1]))
+
+
+class TourLinks:
+    """The two squares either side of each square of a closed tour that is being stitched together.
+
+    Squares are indices (see moves.square_index) of a board <width> squares wide, and a square that isn't linked to
+    another yet has -1 in its place.
+
+    Attributes:
+        width (int): The width of the board.
+        first (array): The square before or after each square.
+        second (array): The other square either side of each square.
+    """
+
+    def __init__(self, width, height):
+        self.width = width
+        self.first = array('l', [-1]) * (width * height)
+        self.second = array('l', [-1]) * (width * height)
+
+    def square(self, x, y) -> int:
+        """Returns the index of the one-based position [x, y]."""
+        return (y - 1) * self.width + (x - 1)
+
+    def link(self, square, other) -> None:
+        """Links <square> to <other>, but not <other> back to <square>."""
+        if self.first[square] < 0:
+            self.first[square] = other
+        else:
+            self.second[square] = other
+
+    def relink(self, square, old, new) -> None:
+        """Replaces the link of <square> to <old> with one to <new>."""
+        if self.first[square] == old:
+            self.first[square] = new
+        else:
+            self.second[square] = new
+
+    def add_path(self, positions, column_start, row_start, closed=True) -> None:
+        """Links the squares of a tour of a block whose bottom-left corner is [column_start + 1, row_start + 1].
+
+        Args:
+            positions (list): The zero-based (x, y) positions of the tour, local to the block, in order.
+            column_start (int): The number of columns to the left of the block.
+            row_start (int): The number of rows below the block.
+            closed (bool): Whether the last square is linked back to the first.
+        """
+        first = self.first
+        second = self.second
+        offset = row_start * self.width + column_start
+        squares = [offset + y * self.width + x for x, y in positions]
+        previous = squares[-1] if closed else -1
+        for current in squares:
+            if previous >= 0:
+                if first[previous] < 0:
+                    first[previous] = current
+                else:
+                    second[previous] = current
+                if first[current] < 0:
+                    first[current] = previous
+                else:
+                    second[current] = previous
+            previous = current
+
+    def swap_moves(self, a1, a2, b1, b2) -> None:
+        """Replaces the moves a1-a2 and b1-b2 with a1-b1 and a2-b2."""
+        self.relink(a1, a2, b1)
+        self.relink(a2, a1, b2)
+        self.relink(b1, b2, a1)
+        self.relink(b2, b1, a2)
+
+    def follow(self, first_square) -> list:
+        """Returns the squares of the closed tour, in order, starting from <first_square>."""
+        first = self.first
+        second = self.second
+        path = [first_square]
+        previous = first_square
+        current = first[first_square]
+        while current != first_square:
+            path.append(current)
+            following = first[current]
+            if following == previous:
+                following = second[current]
+            previous = current
+            current = following
+        return path
+
+
+def stitched_tour(width, height, start) -> list:
+    """Builds a tour of a <width> by <height> board, starting from the Cartesian position <start>, in O(width * height).
+
+    The board is divided into blocks (see block_sizes), and each block is given its structured closed tour. Every
+    structured tour contains these four moves, in Cartesian coordinates local to a <w> by <h> block:
+
+        - [w - 1, h - 2] to [w, h], which is swapped for two moves into the block to its right;
+        - [1, h - 3] to [2, h - 1], which is swapped for two moves into the block to its left;
+        - [3, h - 1] to [5, h], which is swapped for two moves into the block above it;
+        - [2, 1] to [4, 2], which is swapped for two moves into the block below it.
+
+    Swapping a move in each of two separate closed tours for the two moves that join their ends gives a single closed
+    tour of both. The blocks of each row are joined from left to right, and then the rows are joined up the first
+    column of blocks, which leaves one closed tour of the whole board. That tour is then followed from <start>, so it
+    can start from any square. This is the construction Parberry uses to build tours in linear time, with blocks whose
+    tours were found once, by search, and stored in STRUCTURED_TOURS. A board fewer than MIN_BLOCK squares high or
+    wide is built by strip_tour instead.
+
+    Args:
+        width (int): The width of the board, which must satisfy can_stitch.
+        height (int): The height of the board, which must satisfy can_stitch.
+        start (list): The Cartesian position [x, y] of the first square of the tour.
+
+    Return:
+        path (list): The indices (see moves.square_index) of the squares of the tour, in order. The last square is a
+        knight move away from the first, so the tour is closed.
+    """
+    if min(width, height) < MIN_BLOCK:
+        return strip_tour(width, height, start)
+
+    column_sizes = block_sizes(width)
+    row_sizes = block_sizes(height)
+    links = TourLinks(width, height)
+    square = links.square
+
+    row_start = 0
+    for block_height in row_sizes:
+        column_start = 0
+        for block_width in column_sizes:
+            links.add_path(block_tour(block_width, block_height), column_start, row_start)
+            column_start += block_width
+        row_start += block_height
+
+    row_start = 0
+    for row, block_height in enumerate(row_sizes):
+        top = row_start + block_height
+        column_start = 0
+        for block_width in column_sizes[:-1]:
+            right = column_start + block_width
+            links.swap_moves(square(right - 1, top - 2), square(right, top),
+                             square(right + 1, top - 3), square(right + 2, top - 1))
+            column_start = right
+        if row + 1 < len(row_sizes):
+            links.swap_moves(square(3, top - 1), square(5, top),
+                             square(2, top + 1), square(4, top + 2))
+        row_start = top
+
+    return links.follow(moves.square_index(start, width))
+
+
+def strip_tour(width, height, start) -> list:
+    """Builds a tour of a strip fewer than MIN_BLOCK squares high or wide, as stitched_tour does for larger boards.
+
+    The strip is built lying along its length, and transposed afterwards if it is higher than it is wide. With <h>
+    the height of the strip and <l> its length:
+
+        - A strip 5, 6 or 7 squares high is divided into blocks of the lengths STRIP_BLOCKS gives (see block_sizes),
+          and their tours in STRIP_TOURS are joined from left to right as the blocks of a row are in stitched_tour,
+          since each contains the moves [w - 1, h - 2] to [w, h] and [1, h - 3] to [2, h - 1].
+        - A strip 3 squares high has too few rows for any two moves of neighbouring blocks to be swapped that way. It
+          starts as a block 10 or 12 squares long (see SPLICED_STRIP_BASES) instead, and is lengthened 4 squares at a
+          time by splicing SPLICED_PATH in on its right: the move [l - 1, 1] to [l, 3] is replaced by moves from its
+          ends to the ends of the path, which contains that same move at its own right end for the next splice.
+
+    Args:
+        width (int): The width of the board, which must satisfy can_stitch.
+        height (int): The height of the board, which must satisfy can_stitch.
+        start (list): The Cartesian position [x, y] of the first square of the tour.
+
+    Return:
+        path (list): The indices (see moves.square_index) of the squares of the tour, in order, which is closed.
+    """
+    transpose = height > width
+    length, breadth = (height, width) if transpose else (width, height)
+    links = TourLinks(length, breadth)
+    square = links.square
+
+    if breadth == 3:
+        built = SPLICED_STRIP_BASES[length % 4]
+        links.add_path(block_tour(built, breadth), 0, 0)
+        spliced = decode_moves(SPLICED_PATH, *SPLICED_PATH_START)
+        while built < length:
+            left, right = square(built - 1, 1), square(built, 3)
+            first, last = square(built + 1, 2), square(built + 1, 1)
+            links.add_path(spliced, built, 0, closed=False)
+            links.relink(left, right, first)
+            links.relink(right, left, last)
+            links.link(first, left)
+            links.link(last, right)
+            built += 4
+    else:
+        column_sizes = block_sizes(length, *STRIP_BLOCKS[breadth])
+        column_start = 0
+        for block_length in column_sizes:
+            links.add_path(block_tour(block_length, breadth), column_start, 0)
+            column_start += block_length
+
+        column_start = 0
+        for block_length in column_sizes[:-1]:
+            right = column_start + block_length
+            links.swap_moves(square(right - 1, breadth - 2), square(right, breadth),
+                             square(right + 1, breadth - 3), square(right + 2, breadth - 1))
+            column_start = right
+
+    if not transpose:
+        return links.follow(moves.square_index(start, length))
+    path = links.follow(moves.square_index([start[1], start[0]], length))
+    return [(square % length) * breadth + square // length for square in path]
+
+
+# Structured closed tours of every block size block_sizes can produce, keyed by (width, height). Each tour starts on
+# the bottom-left corner and is written as the indices in moves.KNIGHT_MOVES of its moves, the last of which returns
+# to the corner. Every tour contains the four moves described in stitched_tour.
+STRUCTURED_TOURS = {
+    (8, 8): '3432127417075653431760121434503070656324460724411063527031763576',
+    (8, 9): '250212343656507014634312107056302434725656021755327006333050521057145577',
+    (8, 10): '25021214345656035070146343063212163070653642477242127501763307564723306357205577',
+    (8, 11): '2502121343565650701355321210705647212572343650063134775546006343027270354201470546072467',
+    (8, 12): '250212124346565603507014634306321212707630343572070563353075307276472344606331074727436146072467',
+    (8, 13): (
+        '3053431212107052756565424723055036070311305642532741203176531307065272343677255310571665312575257231'
+        '7666'
+    ),
+    (8, 14): (
+        '2121213614345656560702147543416312121274175006461475344121207065225742746176333054706314605663217633'
+        '367530247067'
+    ),
+    (8, 15): (
+        '3432121210705656565343052120365763507014742012121350645602202434725661772325412706466642563212160256'
+        '52074505725013561756'
+    ),
+    (9, 8): '250212434565036070121434361460552031705716303464276523570063420174360747',
+    (9, 10): '212136143606466434312127417052465203077165654163432107672274247214450752741725753417420777',
+    (9, 12): (
+        '2121234356565725036070121302434503052707052756324174441077636653432721366311750316457164214706367432'
+        '71364607'
+    ),
+    (9, 14): (
+        '2121213614360646147212524350365656572503607012272223663134656575212114166141754410754114745006035411'
+        '45714561057125743141064507'
+    ),
+    (10, 8): '34342120527417070527565343412105557142005760147434271310764244702270653274367166',
+    (10, 9): '250212343465670353121052503650107056302436445617701463434111007536425025636713105527036747',
+    (10, 10): '2121361436064664343212174270706565416343416312020672724347465617224107456721257420747103430647063477',
+    (10, 11): (
+        '2121243436146565707012123454216410745527465036163217663212160270527447724277565342211650306474316036'
+        '5074230757'
+    ),
+    (10, 12): (
+        '3434274163121217070527565653424202572202501763336146571752141170656303163255541117555763361271135076'
+        '46123505275360276416'
+    ),
+    (10, 13): (
+        '2121214343503650206036176472135334746565707012272125364245007724345055672521110576033471457176531303'
+        '354175056341014750167431461057'
+    ),
+    (10, 14): (
+        '3434274163121212707065656543060212121434357256566632121116720756302364274441206614555772210054256660'
+        '6342211076334761305460317634246707234776'
+    ),
+    (10, 15): (
+        '2502121213614360646147563056534341631212120706165323450256565031276032164227703574450020672466033634'
+        '72176460652224450030763477532065253071344106450077'
+    ),
+    (11, 8): '2502124343503656707012143434656147071116475343236507230672116035753275332057141747530767',
+    (11, 10): (
+        '3053434212107076520243435741270524650557250716321447630770147433321610074456307147121435744103561750'
+        '5316127656'
+    ),
+    (11, 12): (
+        '2121234345656507070214754163434212120614365031705007416550243027056523163346525657142011456105754125'
+        '01033501754571653101430664270647'
+    ),
+    (11, 14): (
+        '2121213614343465656507070212147212434350365656571420142014141070763335500766421252742465250014603064'
+        '767543425210561146607233317665236120206641347606324677'
+    ),
+    (12, 8): '212343436146560707021250343435657250716322410644763014100705654332713076347763124614723567200647',
+    (12, 9): (
+        '2502123434365650360703507014634343121061435763663212065614722761207056302436425000745036430572277634'
+        '24672067'
+    ),
+    (12, 10): (
+        '2121343435036146565070701302143434505567163420146470707131124345025552000067244457770333257427672113'
+        '50764330752206724667'
+    ),
+    (12, 11): (
+        '2121243434656572503607070212136143606324343656724121707636703333541750520777635743416333671327114707'
+        '44163305460147063174347771344707'
+    ),
+    (12, 12): (
+        '2121234343614656560707021212503434356503025016545055725070701463423633671327742013105714170546033347'
+        '53056011763633520763647143034667212764270647'
+    ),
+    (12, 13): (
+        '3434321212052741707075656542534305212105365650702432775723174777021212361656303234414571167244561636'
+        '12057211705441356016533076346143607472577230317476303576'
+    ),
+    (12, 14): (
+        '2121213614360646147565434341212120707064664222276722434365746567163420142022177470631663633164212541'
+        '65641110556455712102054605463171145660713356321050500365743125703577'
+    ),
+    (12, 15): (
+        '2502121213434356565650360700634343127467222121270614347410645576367770121212347270564721254163344500'
+        '07476722523450255010571454141077534145616461206016323661347431777633367520346077'
+    ),
+    (13, 8): (
+        '2123434356570707021250343434741070545634114672521713366117070565416343250107247436054220606532703602'
+        '7647'
+    ),
+    (13, 10): (
+        '2121343434656503607070121257234361771436636175642123334567211436565707252427607072430213554122560570'
+        '053500772333367532703677463077'
+    ),
+    (13, 12): (
+        '2121234343503614656560707013021250343471767214367636325023367434503002450645055725072420057633607071'
+        '32722464777433325211703556114705246520674102541706452067'
+    ),
+    (13, 14): (
+        '2502121214343436565657250360707012121243434574120670244256501644612011456100074723446072765630322764'
+        '2347145535017035010647252464452105661310555217570063423612764103025776336143064607'
+    ),
+    (14, 8): (
+        '3434342120527417070705654343431641210561447631721052566361271367460703634236022577171243617647213436'
+        '613477146166'
+    ),
+    (14, 9): (
+        '3434342121707070527565434343036707233310530527054636502167521141070765642124431055256021666363216712'
+        '25071656303420546030576306'
+    ),
+    (14, 10): (
+        '2121361436064664343432121707424365657163412120635763561771632327411070616565416317235501032364242565'
+        '7631114107561345610646313501724531057677'
+    ),
+    (14, 11): (
+        '2121243434361465657250724202217052450007076303434450072070563360367472564343360725342120500076765343'
+        '327220654247161014474107450507743112541656103453105777'
+    ),
+    (14, 12): (
+        '3434342741275212127417070705656543425071317764236424431210134657631656112330146576632167222161707647'
+        '21354430147071656325436632216613612065300561446076332067253477633076'
+    ),
+    (14, 13): (
+        '2121214343435036146565670707021212343450270644117075367565416342500141672132712556325002443245055030'
+        '5501654570352175412014101465566022164467216320117435707475341757221602531456105767'
+    ),
+    (14, 14): (
+        '2502121214343435656567070063434253121212706143465741216025603572555650361211110500764721354171656565'
+        '434322110555663211102074763036763330357453577211456703661116324613034670367434103541607453070747'
+    ),
+    (14, 15): (
+        '2502121213614360646147563056534343416312121207070616532352766630213674253135350250365610250277634175'
+        '6701632533354177177633334500545030074250054456072531257103077245414610557214672117613675431743174317'
+        '6303574707'
+    ),
+    (15, 8): (
+        '3053434342120527053575274725070716343270355072333170525571105357721417070565432700234450025307075345'
+        '20672461141064506416'
+    ),
+    (15, 10): (
+        '3053434342741275717416072507021214343434613656570330677232470725777033363324216470501245206036520070'
+        '76550212434505301707446134663301470570352174357066'
+    ),
+    (15, 12): (
+        '2502121243434356565725072470707012121435270756472125316532352766016416665312572553434212120744106336'
+        '50550103007460344417174347553105006352571460742277421147741176365411252753607507'
+    ),
+    (15, 14): (
+        '2121213434343614656565070707021212143606456022024352706460632363053134727433560546567163420124664707'
+        '2306632363212025016641145756305220005520672446101444700063444610074772343567703531366320767222457124'
+        '6707234767'
+    ),
+}
+
+# Structured closed tours of the blocks strip_tour divides strips into, keyed by (length, height), written as
+# STRUCTURED_TOURS are. The tours of strips 5 to 7 squares high contain the moves that join a block to those either side
+# of it (see stitched_tour), and those of strips 3 squares high contain the move SPLICED_PATH is spliced into.
+STRIP_TOURS = {
+    (6, 5): '214356117543164127065224670257',
+    (8, 5): '2144471743412707643421707416534310530767',
+    (10, 5): '31643432065310614360060345703534274127070653410056',
+    (5, 6): '213472567124270564300245603507',
+    (6, 6): '214450227065430317056430612347145607',
+    (7, 6): '302345607274341024725670125417145531270756',
+    (8, 6): '232456070323477014445022707653430317074165424707',
+    (9, 6): '302343567072024364470117464233075614421745022707056416',
+    (6, 7): '305235052741602327063052756432163163076366',
+    (8, 7): '30532134657103305467250101463674234127076543412170741656',
+    (10, 7): '3053434121705245614607202424657120054701634507412464222707063052756416',
+    (10, 3): '305274334716174343052741705006',
+    (12, 3): '305334716035343053052741705036007416',
+}
+
+# The open tour of a 3 by 4 block that strip_tour splices into strips 3 squares high, starting from the zero-based
+# position SPLICED_PATH_START and written as the tours in STRUCTURED_TOURS are, without a move back to the start.
+SPLICED_PATH_START = (0, 1)
+SPLICED_PATH = '35036147147'
@@ -0,0 +1,82 @@
+import unittest
+
+import cache
+import moves
+import stitched
+
+
+def is_tour(width, height, start, path) -> bool:
+    """Checks that <path> visits every square of a <width> by <height> board once, from <start>, by knight moves."""
+    if len(path) != width * height or len(set(path)) != len(path) or path[0] != moves.square_index(start, width):
+        return False
+    for square, following in zip(path, path[1:]):
+        y, x = divmod(square, width)
+        following_y, following_x = divmod(following, width)
+        if (following_x - x, following_y - y) not in moves.KNIGHT_MOVES:
+            return False
+    return True
+
+
+class TourCacheTest(unittest.TestCase):
+    """Stores tours in an in-memory TourCache and reads them back."""
+
+    def setUp(self):
+        self.cache = cache.TourCache(':memory:')
+
+    def test_every_start_round_trips(self):
+        for width, height in [(5, 6), (6, 5), (3, 10), (10, 3), (6, 6)]:
+            self.cache.clear()
+            for square in range(width * height):
+                start = moves.square_position(square, width)
+                path = stitched.stitched_tour(width, height, start)
+                self.cache.put(width, height, start, path)
+                with self.subTest(width=width, height=height, start=start):
+                    self.assertEqual(self.cache.get(width, height, start), path)
+
+    def test_symmetric_boards_share_entries(self):
+        for width, height in [(5, 6), (6, 5), (3, 10), (10, 3)]:
+            self.cache.clear()
+            for square in range(width * height):
+                start = moves.square_position(square, width)
+                self.cache.put(width, height, start, stitched.stitched_tour(width, height, start))
+            for square in range(width * height):
+                x, y = moves.square_position(square, width)
+                for other_width, other_height, other_start in [(height, width, [y, x]),
+                                                               (width, height, [width + 1 - x, height + 1 - y])]:
+                    with self.subTest(width=width, height=height, start=[x, y], other=other_start):
+                        path = self.cache.get(other_width, other_height, other_start)
+                        self.assertTrue(is_tour(other_width, other_height, other_start, path))
+
+    def test_unsolvable_starts_and_misses(self):
+        self.assertIsNone(self.cache.get(4, 4, [1, 1]))
+        self.cache.put(4, 4, [1, 1], [])
+        self.assertEqual(self.cache.get(4, 4, [4, 4]), [])
+
+    def test_least_recently_used_rows_are_evicted(self):
+        small = cache.TourCache(':memory:', max_rows=3)
+        for x in range(1, 6):
+            small.put(3, 10, [x % 3 + 1, x], [])
+        self.assertEqual(small.connection.execute('SELECT COUNT(*) FROM tours').fetchone()[0], 3)
+
+        small.get(3, 10, [3, 3])
+        small.put(3, 10, [1, 9], [])
+        self.assertEqual(small.get(3, 10, [3, 3]), [])
+        self.assertIsNone(small.get(3, 10, [2, 4]))
+
+    def test_tours_are_evicted_past_max_bytes(self):
+        small = cache.TourCache(':memory:', max_bytes=30)
+        for x in range(1, 4):
+            small.put(6, 6, [x, 1], stitched.stitched_tour(6, 6, [x, 1]))
+        self.assertIsNone(small.get(6, 6, [1, 1]))
+        self.assertIsNotNone(small.get(6, 6, [3, 1]))
+
+    def test_maps_round_trip_in_both_orientations(self):
+        answers = bytes(range(15))
+        self.cache.put_map(5, 3, answers)
+        self.assertEqual(self.cache.get_map(5, 3), answers)
+        transposed = bytes(answers[x * 5 + y] for y in range(5) for x in range(3))
+        self.assertEqual(self.cache.get_map(3, 5), transposed)
+
+
+if __name__ == '__main__':
+    unittest.main()
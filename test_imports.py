@@ -0,0 +1,34 @@
+import os
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+import benchmarks
+import cache
+
+
+class ImportBudgetTest(unittest.TestCase):
+    """Enforces the import budget of benchmarks.check_imports, and keeps heavy modules out of the game's start up."""
+
+    def setUp(self):
+        # check_imports stores a tour in cache.default_cache, which has to be a file of the test's own.
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, 'tours.sqlite3')
+        for patcher in [mock.patch.dict(os.environ, {'KNIGHTS_TOUR_CACHE': path}),
+                        mock.patch.object(cache, '_default_caches', threading.local())]:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_cold_lookup_fits_the_budget(self):
+        self.assertEqual(benchmarks.check_imports(), [])
+
+    def test_game_starts_without_the_solver(self):
+        imported = benchmarks.import_times('import main')
+        for name in benchmarks.LAZY_MODULES:
+            self.assertNotIn(name, imported)
+
+
+if __name__ == '__main__':
+    unittest.main()
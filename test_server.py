@@ -0,0 +1,106 @@
+import os
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+import server
+
+
+class FailingExecutor(ThreadPoolExecutor):
+    """An executor whose work always fails, as a broken process pool's does."""
+
+    def submit(self, fn, *args, **kwargs):
+        raise RuntimeError('the executor is broken')
+
+
+class SessionServerTest(unittest.IsolatedAsyncioTestCase):
+    """Drives a SessionServer through an InProcessClient, without a socket."""
+
+    async def asyncSetUp(self):
+        # Solves look tours up in cache.default_cache, which has to be a file of the test's own.
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        environment = mock.patch.dict(os.environ, {'KNIGHTS_TOUR_CACHE': os.path.join(directory.name, 'tours.sqlite3')})
+        environment.start()
+        self.addCleanup(environment.stop)
+        self.server = server.SessionServer(ThreadPoolExecutor(1))
+        self.client = server.InProcessClient(self.server)
+
+    async def asyncTearDown(self):
+        await self.server.stop()
+
+    async def new_game(self, dims=(5, 5), start=(1, 1)) -> int:
+        response = await self.client.request('new', dims=list(dims), start=list(start))
+        self.assertTrue(response['ok'], response)
+        return response['session']
+
+    async def test_moves(self):
+        session = await self.new_game()
+        response = await self.client.request('move', session=session, to=[2, 3])
+        self.assertEqual(response['position'], [2, 3])
+        self.assertEqual(response['visited'], 2)
+
+        response = await self.client.request('move', session=session, to=[2, 3])
+        self.assertFalse(response['ok'])
+        self.assertIn('not a legal move', response['error'])
+
+    async def test_positions_that_are_not_integers(self):
+        response = await self.client.request('new', dims=[5.5, 5], start=[1, 1])
+        self.assertFalse(response['ok'])
+        response = await self.client.request('new', dims=[5, 5], start=['1', 1])
+        self.assertFalse(response['ok'])
+
+        session = await self.new_game()
+        for position in [[2.5, 3], [2, 3.0], ['2', 3], [True, 3], [2, 3, 4], 2, None]:
+            response = await self.client.request('move', session=session, to=position)
+            self.assertFalse(response['ok'], position)
+            self.assertIn("'to'", response['error'])
+        response = await self.client.request('board', session=session)
+        self.assertEqual(response['visited'], 1)
+
+    async def test_sessions_that_are_not_numbers(self):
+        for session in [{'a': 1}, [1], '1', None, True]:
+            response = await self.client.request('move', session=session, to=[2, 3])
+            self.assertFalse(response['ok'], session)
+            self.assertIn("'session'", response['error'])
+
+    async def test_unknown_session_and_command(self):
+        response = await self.client.request('board', session=99)
+        self.assertEqual(response, {'ok': False, 'error': 'no session 99'})
+
+        session = await self.new_game()
+        response = await self.client.request('fly', session=session)
+        self.assertFalse(response['ok'])
+
+    async def test_solve_keeps_the_game_status(self):
+        session = await self.new_game()
+        response = await self.client.request('solve', session=session)
+        self.assertTrue(response['ok'], response)
+        self.assertEqual(response['status'], 'playing')
+        self.assertEqual(response['solve']['status'], 'solved')
+        self.assertEqual(len(response['solve']['tour']), 25)
+
+    async def test_executor_failures_become_errors(self):
+        self.server.executor.shutdown()
+        self.server.executor = FailingExecutor(1)
+        session = await self.new_game()
+        response = await self.client.request('solve', session=session)
+        self.assertFalse(response['ok'])
+        self.assertIn('RuntimeError', response['error'])
+
+        response = await self.client.request('board', session=session)
+        self.assertTrue(response['ok'])
+
+    async def test_idle_sessions_are_evicted(self):
+        session = await self.new_game()
+        self.assertEqual(self.server.evict_idle(), [])
+        last_active = self.server.sessions[session].last_active
+        self.assertEqual(self.server.evict_idle(last_active + self.server.idle_timeout + 1), [session])
+
+        response = await self.client.request('board', session=session)
+        self.assertFalse(response['ok'])
+
+
+if __name__ == '__main__':
+    unittest.main()
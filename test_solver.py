@@ -0,0 +1,46 @@
+import unittest
+
+import solver
+
+
+class CountToursTest(unittest.TestCase):
+    """Checks count_tours against the known numbers of tours of small boards."""
+
+    def test_open_tours(self):
+        self.assertEqual(solver.count_tours(5, 5), 1728)
+        self.assertEqual(solver.count_tours(5, 5, [1, 1]), 304)
+        self.assertEqual(solver.count_tours(1, 1), 1)
+        self.assertEqual(solver.count_tours(4, 4), 0)
+
+    def test_closed_tours(self):
+        self.assertEqual(solver.count_tours(5, 6, closed=True), 480)
+        self.assertEqual(solver.count_tours(5, 5, closed=True), 0)
+
+    def test_counts_match_the_listed_tours(self):
+        for closed in [False, True]:
+            with self.subTest(closed=closed):
+                listed = list(solver.iter_tours(5, 6, [1, 1], closed))
+                self.assertEqual(len(listed), solver.count_tours(5, 6, [1, 1], closed))
+                self.assertEqual(len({tuple(tour) for tour in listed}), len(listed))
+
+
+class ClosedTourTest(unittest.TestCase):
+    """Checks that closed tours are only searched for on boards that can have one."""
+
+    def test_boards_without_closed_tours(self):
+        for width, height in [(7, 7), (31, 31), (4, 10), (3, 8)]:
+            with self.subTest(width=width, height=height):
+                self.assertIsNone(solver.closed_tour(width, height, [1, 1]))
+                result = solver.solve_within(width, height, [1, 1], timeout=1, closed=True)
+                self.assertEqual(result.status, solver.UNSOLVABLE)
+
+    def test_boards_with_closed_tours(self):
+        for width, height in [(6, 6), (5, 6), (3, 10), (8, 8)]:
+            with self.subTest(width=width, height=height):
+                state = solver.closed_tour(width, height, [1, 1])
+                self.assertTrue(state.is_complete())
+                self.assertIn(state.path[0], state.neighbors(state.path[-1]))
+
+
+if __name__ == '__main__':
+    unittest.main()
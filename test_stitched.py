@@ -0,0 +1,51 @@
+import unittest
+
+import moves
+import stitched
+
+
+def assert_closed_tour(test, width, height, start, path):
+    """Checks that <path> is a closed tour of a <width> by <height> board that starts from <start>."""
+    test.assertEqual(len(path), width * height)
+    test.assertEqual(len(set(path)), width * height)
+    test.assertEqual(path[0], moves.square_index(start, width))
+    for square, following in zip(path, path[1:] + path[:1]):
+        y, x = divmod(square, width)
+        following_y, following_x = divmod(following, width)
+        test.assertIn((following_x - x, following_y - y), moves.KNIGHT_MOVES)
+
+
+class StitchedTourTest(unittest.TestCase):
+    """Checks the tours built from the block tours in STRUCTURED_TOURS and STRIP_TOURS."""
+
+    def test_every_stitchable_size(self):
+        for width in range(1, 61):
+            for height in range(1, 61):
+                if not stitched.can_stitch(width, height):
+                    continue
+                with self.subTest(width=width, height=height):
+                    start = [width // 2 + 1, height]
+                    assert_closed_tour(self, width, height, start, stitched.stitched_tour(width, height, start))
+
+    def test_every_start_of_strips(self):
+        for width, height in [(3, 14), (14, 3), (5, 16), (6, 11), (16, 7)]:
+            for square in range(width * height):
+                start = moves.square_position(square, width)
+                with self.subTest(width=width, height=height, start=start):
+                    assert_closed_tour(self, width, height, start, stitched.stitched_tour(width, height, start))
+
+    def test_boards_without_closed_tours_are_not_stitched(self):
+        for width, height in [(4, 100), (100, 4), (3, 8), (3, 101), (5, 7), (7, 9), (1, 60), (2, 60), (9, 9)]:
+            with self.subTest(width=width, height=height):
+                self.assertFalse(stitched.can_stitch(width, height))
+
+    def test_strips_are_stitched_whatever_their_size(self):
+        self.assertTrue(stitched.should_stitch(200, 3))
+        self.assertTrue(stitched.should_stitch(6, 6))
+        self.assertFalse(stitched.should_stitch(50, 4))
+        self.assertFalse(stitched.should_stitch(20, 20))
+        self.assertTrue(stitched.should_stitch(200, 200))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+import os
+import tempfile
+import unittest
+
+import moves
+import stitched
+import tourfile
+
+
+class TourFileTest(unittest.TestCase):
+    """Writes tours with write_tour and reads them back with TourFile."""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'tour.kt')
+
+    def test_round_trips_in_both_encodings(self):
+        for width, height in [(10, 10), (3, 10), (300, 300)]:
+            path = stitched.stitched_tour(width, height, [1, 1])
+            for encoding in [tourfile.ORDER, tourfile.DIRECTIONS]:
+                with self.subTest(width=width, height=height, encoding=encoding):
+                    tourfile.write_tour(self.path, width, height, path, encoding)
+                    self.assertEqual(tourfile.read_tour(self.path), (width, height, path))
+                    with tourfile.TourFile(self.path) as tour:
+                        for step in [1, len(path) // 2, len(path)]:
+                            position = moves.square_position(path[step - 1], width)
+                            self.assertEqual(tour.step_at(position), step)
+
+    def test_partial_and_empty_tours(self):
+        for encoding in [tourfile.ORDER, tourfile.DIRECTIONS]:
+            for path in [[], [0], [0, 7, 14]]:
+                with self.subTest(encoding=encoding, path=path):
+                    tourfile.write_tour(self.path, 5, 5, path, encoding)
+                    self.assertEqual(tourfile.read_tour(self.path), (5, 5, path))
+                    with tourfile.TourFile(self.path) as tour:
+                        self.assertEqual(tour.step_at([5, 5]), 0)
+
+    def test_truncated_files_are_rejected(self):
+        path = stitched.stitched_tour(10, 10, [1, 1])
+        for encoding in [tourfile.ORDER, tourfile.DIRECTIONS]:
+            tourfile.write_tour(self.path, 10, 10, path, encoding)
+            with open(self.path, 'rb') as saved:
+                data = saved.read()
+            for size in [0, 10, tourfile.HEADER.size, 60, len(data) - 1]:
+                with self.subTest(encoding=encoding, size=size):
+                    with open(self.path, 'wb') as truncated:
+                        truncated.write(data[:size])
+                    with self.assertRaises(ValueError):
+                        tourfile.TourFile(self.path)
+
+    def test_other_files_are_rejected(self):
+        with open(self.path, 'wb') as other:
+            other.write(b'not a tour file, but long enough to hold a header')
+        with self.assertRaises(ValueError):
+            tourfile.TourFile(self.path)
+
+
+if __name__ == '__main__':
+    unittest.main()
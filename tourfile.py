@@ -0,0 +1,155 @@
+import mmap
+import struct
+import sys
+from array import array
+
+import moves
+
+# Every tour file starts with this, followed by a format version.
+MAGIC = b'KTOUR'
+VERSION = 1
+
+# The ways the squares of a tour can be stored after the header.
+ORDER = 0  # The step at which each square is visited, one unsigned integer per square, in square index order.
+DIRECTIONS = 1  # The moves of the tour packed 3 bits each by moves.pack_directions.
+
+# Magic, version, encoding, bytes per step (for ORDER), width, height, start square and number of squares in the tour,
+# all little-endian.
+HEADER = struct.Struct('<5sBBBIIII')
+
+
+def write_tour(file_path, width, height, path, encoding=ORDER) -> None:
+    """Saves a tour of a <width> by <height> board to <file_path>.
+
+    With ORDER, every square takes 2 bytes (or 4 on boards of more than 65535 squares), and the step of any square can
+    be read straight from the file by TourFile.step_at. DIRECTIONS is the most compact, at 3 bits per move, but the
+    whole tour has to be unpacked to find the step of a square.
+
+    Args:
+        file_path (str): The file to write.
+        width (int): The width of the board.
+        height (int): The height of the board.
+        path (list): The indices (see moves.square_index) of the squares of the tour, in order. It doesn't have to
+                cover the whole board.
+        encoding (int): ORDER or DIRECTIONS.
+    """
+    if encoding not in (ORDER, DIRECTIONS):
+        raise ValueError(f'unknown tour encoding {encoding}')
+
+    step_size = 2 if width * height <= 0xFFFF else 4
+    start = path[0] if path else 0
+    with open(file_path, 'wb') as output:
+        output.write(HEADER.pack(MAGIC, VERSION, encoding, step_size, width, height, start, len(path)))
+        if encoding == DIRECTIONS:
+            output.write(moves.pack_directions(path, width))
+            return
+
+        order = array('H' if step_size == 2 else 'I', bytes(step_size * width * height))
+        for step, square in enumerate(path, 1):
+            order[square] = step
+        if sys.byteorder == 'big':
+            order.byteswap()
+        output.write(order.tobytes())
+
+
+class TourFile:
+    """A tour saved by write_tour, read through a memory map so that only the parts that are used are ever loaded.
+
+    Use it as a context manager, or call close, to release the file.
+
+    Attributes:
+        width (int): The width of the board.
+        height (int): The height of the board.
+        start (int): The index of the first square of the tour.
+        length (int): The number of squares in the tour.
+        encoding (int): ORDER or DIRECTIONS.
+    """
+
+    def __init__(self, file_path):
+        self._file = open(file_path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f'{file_path} is empty, not a tour file')
+
+        if len(self._map) < HEADER.size:
+            self.close()
+            raise ValueError(f'{file_path} is not a tour file')
+        magic, version, self.encoding, step_size, self.width, self.height, self.start, self.length = \
+            HEADER.unpack_from(self._map)
+        if magic != MAGIC or version != VERSION or self.encoding not in (ORDER, DIRECTIONS):
+            self.close()
+            raise ValueError(f'{file_path} is not a tour file of version {VERSION}')
+
+        if self.encoding == ORDER:
+            payload = step_size * self.width * self.height
+        else:
+            payload = (3 * (self.length - 1) + 7) // 8 if self.length else 0
+        stored = len(self._map) - HEADER.size
+        if step_size not in (2, 4) or self.length > self.width * self.height or stored < payload:
+            self.close()
+            raise ValueError(f'{file_path} is truncated or corrupt: its header needs {payload} bytes of tour, but it '
+                             f'has {stored}')
+
+        self._step = struct.Struct('<H' if step_size == 2 else '<I')
+        self._order = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self) -> None:
+        """Unmaps and closes the file."""
+        self._map.close()
+        self._file.close()
+
+    def path(self) -> list:
+        """Returns the indices of the squares of the tour, in order."""
+        if self.encoding == DIRECTIONS:
+            if not self.length:
+                return []
+            return moves.unpack_directions(self._map[HEADER.size:], self.start, self.length, self.width)
+
+        order = array('H' if self._step.size == 2 else 'I')
+        order.frombytes(self._map[HEADER.size:HEADER.size + self._step.size * self.width * self.height])
+        if sys.byteorder == 'big':
+            order.byteswap()
+        path = [0] * self.length
+        for square, step in enumerate(order):
+            if step:
+                path[step - 1] = square
+        return path
+
+    def step_at(self, position) -> int:
+        """Returns the step (counting from 1) at which the tour visits the Cartesian <position> [x, y], or 0 if it never
+        does.
+
+        In ORDER files this reads just the bytes of that square from the file. DIRECTIONS files are unpacked the first
+        time this is called, and the steps of every square are kept for later calls.
+        """
+        x, y = position
+        if not (0 < x <= self.width and 0 < y <= self.height):
+            raise IndexError(f'{position} is not on a {self.width}x{self.height} board')
+        square = moves.square_index(position, self.width)
+
+        if self.encoding == ORDER:
+            return self._step.unpack_from(self._map, HEADER.size + square * self._step.size)[0]
+
+        if self._order is None:
+            self._order = array('I', bytes(4 * self.width * self.height))
+            for step, visited in enumerate(self.path(), 1):
+                self._order[visited] = step
+        return self._order[square]
+
+
+def read_tour(file_path) -> tuple:
+    """Loads the whole of a tour saved by write_tour.
+
+    Return:
+        tour (tuple): (width, height, path), where path holds the indices of the squares of the tour, in order.
+    """
+    with TourFile(file_path) as tour:
+        return tour.width, tour.height, tour.path()
@@ -0,0 +1,108 @@
+import cache
+import gameboard
+
+# The most seconds a board gets, when the caller gives no budget, if a search of it may never finish (see
+# default_timeout).
+UNSTITCHED_TIMEOUT = 60.0
+
+
+def default_timeout(width, height):
+    """Returns the budget of a search of a <width> by <height> board whose caller doesn't give one.
+
+    Boards that stitched.should_stitch are never searched, and the search of any other board at least 5 squares on
+    each side with an even number of squares is one Warnsdorff's rule all but always finishes. The rest, strips at most
+    4 squares high or wide and boards with an odd number of squares, have no closed tour, and a search of them can run
+    for ever, so they are given UNSTITCHED_TIMEOUT seconds; any other board is searched to the end.
+
+    Return:
+        timeout (float or None): The most seconds to search for, or None for no limit.
+    """
+    if min(width, height) > 4 and (width * height) % 2 == 0:
+        return None
+    import stitched  # Loads the block tours, so only for the boards that need it.
+    return None if stitched.should_stitch(width, height) else UNSTITCHED_TIMEOUT
+
+
+def winning_board(board, starting_move, warnsdorff=True, use_cache=True, observer=None) -> list:
+    """The main call of the algorithm that determines if a given board with a given starting move is solvable.
+
+    The search itself is done by solver.extend_tour on a compact TourState, which moves and backtracks in place
+    instead of copying the board at every step; the board is only filled in with numbers once a solution is found.
+    It will evaluate all possible sequences of allowable moves stemming from the starting move until it finds a
+    solution, in which case it returns the solved board. If all possible move sequences are exhausted without a
+    solution, it returns and empty list.
+
+    When <warnsdorff> is True, the moves from each position are tried in Warnsdorff order (see
+    solver.warnsdorff_order), so the first sequence tried is almost always a solution and backtracking is only needed
+    to recover from the rare dead end, or to prove that no solution exists.
+
+    When <use_cache> is True, the answer is first looked up in cache.default_cache, and stored there once it has been
+    found. The solver is only imported on a miss, so a cached answer comes back without loading it at all.
+
+    The search has no budget, so a board that default_timeout gives one to should go through winning_result instead.
+
+    Args:
+        board (list): A list of lists, whose internal elements should only be underscores, as this board should not have
+                been played on yet.
+        starting_move (list): A pair of Cartesian coordinates, in the form [x, y].
+        warnsdorff (bool): Whether to try moves in Warnsdorff order rather than the order of
+                gameboard.possible_next_moves.
+        use_cache (bool): Whether to look up and store the answer in the on-disk cache of tours.
+        observer (progress.SearchObserver): Watches the progress of the search, if one is needed.
+
+    Return:
+        board (list): Either a solved board with the spots fill with integers (the order in which they were played), or
+        an empty list if not solution is found.
+    """
+    width = len(board[0])
+    height = len(board)
+    path = winning_path(width, height, starting_move, warnsdorff, use_cache, observer)
+    if not path:
+        return []
+
+    return gameboard.board_from_path(width, height, path)
+
+
+def winning_path(width, height, starting_move, warnsdorff=True, use_cache=True, observer=None) -> list:
+    """Finds a tour of a <width> by <height> board starting from <starting_move>, as winning_board does.
+
+    Return:
+        path (list): The indices (see moves.square_index) of the squares of the tour, in order, or an empty list if
+        no solution is found.
+    """
+    tour_cache = cache.default_cache() if use_cache else None
+
+    path = tour_cache.get(width, height, starting_move) if tour_cache else None
+    if path is None:
+        import solver  # Only needed on a cache miss.
+        state = solver.solve(width, height, starting_move, warnsdorff, observer=observer)
+        path = state.path if state else []
+        if tour_cache:
+            tour_cache.put(width, height, starting_move, path)
+
+    return path
+
+
+def winning_result(width, height, starting_move, timeout=None, max_nodes=None, cancel=None, warnsdorff=True,
+                   use_cache=True, observer=None):
+    """Finds a tour as winning_path does, but within a budget of time or moves (see solver.solve_within).
+
+    A tour, or a proof that there is none, is looked up in and stored in the cache as in winning_path. A search that
+    runs out of budget isn't stored, so the same start can be tried again with a larger budget.
+
+    Return:
+        result (solver.SolveResult): Whether a tour was found, proven not to exist, or the budget ran out first,
+        with the tour or the longest partial tour found.
+    """
+    import solver
+    tour_cache = cache.default_cache() if use_cache else None
+
+    path = tour_cache.get(width, height, starting_move) if tour_cache else None
+    if path is not None:
+        return solver.SolveResult(solver.SOLVED if path else solver.UNSOLVABLE, path)
+
+    result = solver.solve_within(width, height, starting_move, timeout, max_nodes, cancel, warnsdorff=warnsdorff,
+                                 observer=observer)
+    if tour_cache and not result.exhausted:
+        tour_cache.put(width, height, starting_move, result.path)
+    return result